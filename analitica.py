@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Analítica.
+
+Calcula agregados para reportes de gestión (ocupación por instructor, mezcla
+de suscripciones, clases por miembro y distribución de la tasa de llenado) en
+una sola pasada por archivo. Los resultados se guardan como vistas
+materializadas que se invalidan cuando cambia la firma (mtime/tamaño) de
+alguno de los archivos de datos.
+
+Si NumPy está instalado se usa para las estadísticas de llenado; si no, se
+recurre a la biblioteca estándar.
+"""
+
+import bisect
+import statistics
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import datos
+import particiones
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# Límites superiores de los tramos de llenado (fracción del cupo).
+TRAMOS_LLENADO = (0.25, 0.5, 0.75, 1.0)
+ETIQUETAS_TRAMOS = ("0-25%", "25-50%", "50-75%", "75-100%", ">100%")
+
+_cache: Dict[Tuple[str, str, str], Tuple[Tuple, Dict[str, Any]]] = {}
+
+
+def _distribucion_llenado(tasas: List[float]) -> Dict[str, Any]:
+    """Agrupa las tasas de llenado en tramos y calcula estadísticas básicas."""
+    if not tasas:
+        return {
+            "tramos": dict.fromkeys(ETIQUETAS_TRAMOS, 0),
+            "media": 0.0,
+            "mediana": 0.0,
+            "minimo": 0.0,
+            "maximo": 0.0,
+        }
+
+    if np is not None:
+        arreglo = np.asarray(tasas, dtype=float)
+        # side="left" hace que el límite superior pertenezca a su tramo.
+        posiciones = np.searchsorted(TRAMOS_LLENADO, arreglo, side="left")
+        conteo = np.bincount(posiciones, minlength=len(ETIQUETAS_TRAMOS))
+        return {
+            "tramos": dict(zip(ETIQUETAS_TRAMOS, (int(n) for n in conteo))),
+            "media": float(arreglo.mean()),
+            "mediana": float(np.median(arreglo)),
+            "minimo": float(arreglo.min()),
+            "maximo": float(arreglo.max()),
+        }
+
+    conteo = Counter(bisect.bisect_left(TRAMOS_LLENADO, t) for t in tasas)
+    return {
+        "tramos": {e: conteo.get(i, 0) for i, e in enumerate(ETIQUETAS_TRAMOS)},
+        "media": statistics.fmean(tasas),
+        "mediana": statistics.median(tasas),
+        "minimo": min(tasas),
+        "maximo": max(tasas),
+    }
+
+
+def calcular_vistas(
+    filepath_miembros: str, filepath_clases: str, filepath_inscripciones: str
+) -> Dict[str, Any]:
+    """
+    Calcula todas las vistas recorriendo cada archivo una sola vez.
+
+    :return: Diccionario con las claves `ocupacion_por_instructor`,
+        `mezcla_suscripciones`, `clases_por_miembro`,
+        `distribucion_clases_por_miembro`, `tasa_llenado` y
+        `distribucion_llenado`.
+    """
+    mezcla: Counter = Counter()
+    clases_por_miembro: Dict[str, int] = {}
+    for miembro in datos.cargar_datos(filepath_miembros):
+        mezcla[miembro.get("tipo_suscripcion", "")] += 1
+        clases_por_miembro[miembro.get("id_miembro", "")] = 0
+
+    inscritos_por_clase: Counter = Counter()
+    for insc in particiones.cargar_inscripciones(filepath_inscripciones):
+        inscritos_por_clase[insc.get("id_clase")] += 1
+        id_miembro = insc.get("id_miembro")
+        if id_miembro in clases_por_miembro:
+            clases_por_miembro[id_miembro] += 1
+
+    por_instructor: Dict[str, Dict[str, Any]] = {}
+    tasa_llenado: Dict[str, float] = {}
+    for clase in datos.cargar_datos(filepath_clases):
+        try:
+            cupo = int(clase.get("cupo_maximo", 0))
+        except ValueError:
+            continue
+        id_clase = clase.get("id_clase")
+        inscritos = inscritos_por_clase.get(id_clase, 0)
+        if cupo > 0:
+            tasa_llenado[id_clase] = inscritos / cupo
+
+        fila = por_instructor.setdefault(
+            clase.get("instructor", ""),
+            {"clases": 0, "cupo_total": 0, "inscritos": 0, "ocupacion": 0.0},
+        )
+        fila["clases"] += 1
+        fila["cupo_total"] += cupo
+        fila["inscritos"] += inscritos
+
+    for fila in por_instructor.values():
+        if fila["cupo_total"] > 0:
+            fila["ocupacion"] = fila["inscritos"] / fila["cupo_total"]
+
+    return {
+        "ocupacion_por_instructor": por_instructor,
+        "mezcla_suscripciones": dict(mezcla),
+        "clases_por_miembro": clases_por_miembro,
+        "distribucion_clases_por_miembro": dict(
+            sorted(Counter(clases_por_miembro.values()).items())
+        ),
+        "tasa_llenado": tasa_llenado,
+        "distribucion_llenado": _distribucion_llenado(list(tasa_llenado.values())),
+    }
+
+
+def obtener_vistas(
+    filepath_miembros: str, filepath_clases: str, filepath_inscripciones: str
+) -> Dict[str, Any]:
+    """
+    Retorna las vistas materializadas, recalculándolas solo si alguno de los
+    archivos de datos cambió desde el último cálculo.
+    """
+    clave = (filepath_miembros, filepath_clases, filepath_inscripciones)
+    firmas = tuple(datos.firma_archivo(ruta) for ruta in clave)
+
+    en_cache = _cache.get(clave)
+    if en_cache and en_cache[0] == firmas:
+        return en_cache[1]
+
+    vistas = calcular_vistas(*clave)
+    _cache[clave] = (firmas, vistas)
+    return vistas
+
+
+def invalidar_cache() -> None:
+    """Descarta todas las vistas materializadas."""
+    _cache.clear()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Arranque.
+
+Reduce el tiempo de inicio: los archivos de datos se verifican/crean en
+paralelo y luego se precargan e indexan en un pool de hilos mientras el menú
+principal ya está en pantalla. La precarga llena la caché de `datos`, de modo
+que la primera acción del usuario no paga el costo de parsear los archivos.
+
+Los tiempos de cada fase (importación de módulos, inicialización, menú
+disponible y precarga) se guardan en un informe que puede mostrarse con
+`python main.py --tiempos`.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+import datos
+import particiones
+
+console = Console()
+
+# Campo por el que se indexa cada archivo durante la precarga.
+CLAVES_INDICE = {"miembros.csv": "id_miembro", "clases.csv": "id_clase"}
+
+
+def _precargar(filepath: str, informe: Dict[str, Any]) -> None:
+    inicio = time.perf_counter()
+    if os.path.isdir(filepath):
+        for id_clase in particiones.listar_ids_clases(filepath):
+            datos.cargar_datos(particiones.ruta_particion(filepath, id_clase))
+    else:
+        datos.cargar_datos(filepath)
+        clave = CLAVES_INDICE.get(os.path.basename(filepath))
+        if clave:
+            datos.indexar(filepath, clave)
+    informe["precarga"][filepath] = time.perf_counter() - inicio
+
+
+def iniciar(*filepaths: str, inicio: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Inicializa los archivos en paralelo y lanza su precarga en segundo plano.
+
+    Retorna en cuanto los archivos existen; la precarga sigue en hilos del
+    pool.
+
+    :param inicio: Valor de `time.perf_counter()` tomado al arrancar el
+        proceso, antes de las importaciones. Si se indica, el tiempo hasta
+        esta llamada se reporta como la fase de importación y el del menú se
+        mide desde ese momento.
+    :return: Informe de tiempos (se completa a medida que termina la precarga).
+    """
+    ahora = time.perf_counter()
+    informe: Dict[str, Any] = {
+        "inicio": ahora if inicio is None else inicio,
+        "importacion": None if inicio is None else ahora - inicio,
+        "inicializacion": None,
+        "menu": None,
+        "precarga": {},
+        "futuros": [],
+    }
+
+    # Los directorios se crean antes para que los hilos no compitan por ellos.
+    for directorio in {os.path.dirname(f) for f in filepaths}:
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+    pool = ThreadPoolExecutor(
+        max_workers=max(len(filepaths), 1), thread_name_prefix="precarga"
+    )
+    list(pool.map(datos.inicializar_archivo, filepaths))
+    informe["inicializacion"] = time.perf_counter() - ahora
+
+    informe["futuros"] = [pool.submit(_precargar, f, informe) for f in filepaths]
+    pool.shutdown(wait=False)
+    return informe
+
+
+def marcar_menu(informe: Dict[str, Any]) -> None:
+    """Registra el momento (desde el inicio) en que el menú queda disponible."""
+    informe["menu"] = time.perf_counter() - informe["inicio"]
+
+
+def esperar_precarga(informe: Dict[str, Any], timeout: Optional[float] = None) -> bool:
+    """
+    Espera a que termine la precarga.
+
+    :return: True si terminó dentro del tiempo indicado.
+    """
+    _, pendientes = wait(informe["futuros"], timeout=timeout)
+    return not pendientes
+
+
+def mostrar_informe(informe: Dict[str, Any]) -> None:
+    """Muestra el informe de tiempos de arranque."""
+    tabla = Table(title="TIEMPOS DE ARRANQUE", style="cyan")
+    tabla.add_column("Fase", style="yellow")
+    tabla.add_column("Tiempo (ms)", justify="right")
+
+    if informe["importacion"] is not None:
+        tabla.add_row("Importación de módulos", f"{informe['importacion'] * 1000:.1f}")
+    tabla.add_row(
+        "Inicialización de archivos", f"{informe['inicializacion'] * 1000:.1f}"
+    )
+    if informe["menu"] is not None:
+        tabla.add_row(
+            "Menú disponible (desde el inicio)", f"{informe['menu'] * 1000:.1f}"
+        )
+    for filepath, segundos in sorted(informe["precarga"].items()):
+        tabla.add_row(f"Precarga {filepath}", f"{segundos * 1000:.1f}")
+    console.print(tabla)
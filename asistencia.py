@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Asistencia.
+
+Registra las asistencias reales (check-ins) a las clases en un log de eventos
+de solo-anexado, particionado por día (`eventos_AAAA-MM-DD.jsonl`): registrar
+una asistencia escribe una línea al final de la partición del día, sin
+reescribir nada.
+
+Los agregados por hora y por día, por clase y por miembro, se guardan en
+`resumen.json` junto con la posición (en bytes) hasta la que se procesó cada
+partición. Al consultar, solo se leen los eventos nuevos desde esa posición,
+de modo que las consultas no vuelven a recorrer todo el log. La actualización
+del resumen se serializa con un bloqueo de archivo (`.resumen.lock`), así que
+varios procesos pueden consultar a la vez sin contar dos veces un evento.
+"""
+
+import json
+import os
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import datos
+import particiones
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+PREFIJO_EVENTOS = "eventos_"
+RESUMEN_FILE = "resumen.json"
+BLOQUEO_FILE = ".resumen.lock"
+
+
+def ruta_particion(directorio: str, dia: date) -> str:
+    """Retorna la ruta de la partición de eventos de un día."""
+    return os.path.join(directorio, f"{PREFIJO_EVENTOS}{dia.isoformat()}.jsonl")
+
+
+def _evento(id_miembro: str, id_clase: str, momento: datetime) -> Dict[str, str]:
+    return {
+        "id_miembro": id_miembro,
+        "id_clase": id_clase,
+        "momento": momento.isoformat(timespec="seconds"),
+    }
+
+
+def registrar_asistencia(
+    directorio: str,
+    id_miembro: str,
+    id_clase: str,
+    momento: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """
+    Registra una asistencia anexándola a la partición del día.
+
+    :param momento: Fecha y hora de la asistencia; por defecto, ahora.
+    :return: El evento registrado.
+    """
+    return registrar_lote(directorio, [(id_miembro, id_clase, momento)])[0]
+
+
+def registrar_lote(
+    directorio: str,
+    asistencias: Iterable[Tuple[str, str, Optional[datetime]]],
+) -> List[Dict[str, str]]:
+    """
+    Registra varias asistencias abriendo cada partición una sola vez.
+
+    :param asistencias: Tuplas (id_miembro, id_clase, momento); un momento
+        None se interpreta como ahora.
+    :return: Lista de eventos registrados.
+    """
+    por_dia: Dict[date, List[Dict[str, str]]] = defaultdict(list)
+    eventos = []
+    for id_miembro, id_clase, momento in asistencias:
+        momento = momento or datetime.now()
+        evento = _evento(id_miembro, id_clase, momento)
+        por_dia[momento.date()].append(evento)
+        eventos.append(evento)
+
+    os.makedirs(directorio, exist_ok=True)
+    for dia, eventos_dia in por_dia.items():
+        lineas = "".join(json.dumps(e) + "\n" for e in eventos_dia)
+        with open(ruta_particion(directorio, dia), mode="a", encoding="utf-8") as f:
+            f.write(lineas)
+    return eventos
+
+
+def _resumen_vacio() -> Dict[str, Any]:
+    return {
+        "posiciones": {},
+        "clase_hora": {},
+        "clase_dia": {},
+        "miembro_hora": {},
+        "miembro_dia": {},
+    }
+
+
+def cargar_resumen(directorio: str) -> Dict[str, Any]:
+    """
+    Carga los agregados guardados (sin procesar eventos nuevos).
+
+    Un resumen ilegible o al que le falta algún agregado (de una versión
+    anterior) se descarta: se reconstruye desde el log en la próxima
+    actualización.
+    """
+    ruta = os.path.join(directorio, RESUMEN_FILE)
+    try:
+        with open(ruta, mode="r", encoding="utf-8") as json_file:
+            resumen = json.load(json_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _resumen_vacio()
+    if not isinstance(resumen, dict) or not set(_resumen_vacio()) <= set(resumen):
+        return _resumen_vacio()
+    return resumen
+
+
+def _sumar(agregado: Dict[str, Dict[str, int]], clave: str, periodo: str) -> None:
+    por_periodo = agregado.setdefault(clave, {})
+    por_periodo[periodo] = por_periodo.get(periodo, 0) + 1
+
+
+@contextmanager
+def _bloqueo_resumen(directorio: str) -> Iterator[None]:
+    """Bloqueo exclusivo entre procesos (e hilos) sobre `resumen.json`."""
+    with open(os.path.join(directorio, BLOQUEO_FILE), mode="a+b") as archivo:
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def actualizar_resumen(directorio: str) -> Dict[str, Any]:
+    """
+    Incorpora a los agregados los eventos anexados desde la última vez.
+
+    Cada partición se lee desde la posición guardada hasta el último salto de
+    línea completo, así que una línea a medio escribir se procesa en la
+    siguiente actualización. La lectura y escritura del resumen se hacen bajo
+    un bloqueo de archivo, de modo que dos llamadas concurrentes no procesan
+    los mismos eventos.
+
+    :return: El resumen actualizado.
+    """
+    if not os.path.isdir(directorio):
+        return cargar_resumen(directorio)
+    with _bloqueo_resumen(directorio):
+        return _actualizar_resumen(directorio)
+
+
+def _actualizar_resumen(directorio: str) -> Dict[str, Any]:
+    resumen = cargar_resumen(directorio)
+
+    posiciones = resumen["posiciones"]
+    hubo_cambios = False
+    for nombre in sorted(os.listdir(directorio)):
+        if not (nombre.startswith(PREFIJO_EVENTOS) and nombre.endswith(".jsonl")):
+            continue
+        inicio = posiciones.get(nombre, 0)
+        if os.path.getsize(os.path.join(directorio, nombre)) <= inicio:
+            continue
+
+        with open(os.path.join(directorio, nombre), mode="rb") as f:
+            f.seek(inicio)
+            bloque = f.read()
+        completo = bloque[: bloque.rfind(b"\n") + 1]
+        for linea in completo.splitlines():
+            try:
+                evento = json.loads(linea)
+                momento = datetime.fromisoformat(evento["momento"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            hora = momento.strftime("%Y-%m-%dT%H")
+            dia = momento.date().isoformat()
+            _sumar(resumen["clase_hora"], evento.get("id_clase", ""), hora)
+            _sumar(resumen["clase_dia"], evento.get("id_clase", ""), dia)
+            _sumar(resumen["miembro_hora"], evento.get("id_miembro", ""), hora)
+            _sumar(resumen["miembro_dia"], evento.get("id_miembro", ""), dia)
+
+        if completo:
+            posiciones[nombre] = inicio + len(completo)
+            hubo_cambios = True
+
+    if hubo_cambios:
+        datos.guardar_datos(os.path.join(directorio, RESUMEN_FILE), resumen)
+    return resumen
+
+
+def _filtrar(
+    por_periodo: Dict[str, int], desde: Optional[date], hasta: Optional[date]
+) -> Dict[str, int]:
+    inicio = desde.isoformat() if desde else ""
+    # Los periodos por hora ("AAAA-MM-DDTHH") también quedan dentro de `hasta`.
+    fin = (hasta + timedelta(days=1)).isoformat() if hasta else None
+    return {
+        p: n
+        for p, n in sorted(por_periodo.items())
+        if p >= inicio and (fin is None or p < fin)
+    }
+
+
+def asistencias_por_clase(
+    directorio: str,
+    id_clase: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    por_hora: bool = False,
+) -> Dict[str, int]:
+    """
+    Retorna el número de asistencias de una clase por día (o por hora).
+
+    :param desde: Primer día incluido; None para no acotar.
+    :param hasta: Último día incluido; None para no acotar.
+    :param por_hora: Si es True, agrupa por hora (`AAAA-MM-DDTHH`).
+    """
+    resumen = actualizar_resumen(directorio)
+    agregado = resumen["clase_hora"] if por_hora else resumen["clase_dia"]
+    return _filtrar(agregado.get(id_clase, {}), desde, hasta)
+
+
+def asistencias_por_miembro(
+    directorio: str,
+    id_miembro: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    por_hora: bool = False,
+) -> Dict[str, int]:
+    """
+    Retorna el número de asistencias de un miembro por día (o por hora).
+
+    :param por_hora: Si es True, agrupa por hora (`AAAA-MM-DDTHH`).
+    """
+    resumen = actualizar_resumen(directorio)
+    agregado = resumen["miembro_hora"] if por_hora else resumen["miembro_dia"]
+    return _filtrar(agregado.get(id_miembro, {}), desde, hasta)
+
+
+def tasa_asistencia_clase(
+    directorio: str,
+    filepath_inscripciones: str,
+    id_clase: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+) -> float:
+    """
+    Calcula la tasa de asistencia de una clase en un periodo.
+
+    Se define como asistencias / (inscritos × días con sesión), donde un día
+    con sesión es un día con al menos una asistencia registrada.
+
+    :return: Tasa entre 0 y 1 (puede superar 1 si asisten no inscritos);
+        0.0 si no hay inscritos o sesiones.
+    """
+    por_dia = asistencias_por_clase(directorio, id_clase, desde, hasta)
+    if particiones.es_particionado(filepath_inscripciones):
+        inscritos = len(particiones.cargar_particion(filepath_inscripciones, id_clase))
+    else:
+        inscritos = sum(
+            1
+            for i in particiones.iterar_inscripciones(filepath_inscripciones)
+            if i.get("id_clase") == id_clase
+        )
+    return _tasa(por_dia, inscritos)
+
+
+def _tasa(por_dia: Dict[str, int], inscritos: int) -> float:
+    if not inscritos or not por_dia:
+        return 0.0
+    return sum(por_dia.values()) / (inscritos * len(por_dia))
+
+
+def resumen_por_clase(
+    directorio: str,
+    filepath_inscripciones: str,
+    ids_clases: Iterable[str],
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Sesiones, asistencias y tasa de asistencia de varias clases a la vez.
+
+    Actualiza el resumen una sola vez y cuenta los inscritos de todas las
+    clases en una sola pasada, en lugar de repetir ambas cosas por clase.
+
+    :return: {id_clase: {"sesiones", "asistencias", "tasa"}}.
+    """
+    clase_dia = actualizar_resumen(directorio)["clase_dia"]
+    inscritos = Counter(
+        str(i.get("id_clase"))
+        for i in particiones.iterar_inscripciones(filepath_inscripciones)
+    )
+    resultado = {}
+    for id_clase in ids_clases:
+        por_dia = _filtrar(clase_dia.get(id_clase, {}), desde, hasta)
+        resultado[id_clase] = {
+            "sesiones": len(por_dia),
+            "asistencias": sum(por_dia.values()),
+            "tasa": _tasa(por_dia, inscritos[id_clase]),
+        }
+    return resultado
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Pruebas de Carga.
+
+Lanza N trabajadores (procesos o hilos) que ejecutan inscripciones, bajas y
+eliminaciones de miembros contra un directorio de datos temporal, con una
+mezcla de operaciones configurable. Al final reporta el rendimiento
+(operaciones por segundo y percentiles de latencia) y las violaciones de
+invariantes encontradas en el estado final:
+
+- sobrecupo: una clase con más inscritos que su cupo máximo.
+- duplicadas: el mismo miembro inscrito dos veces en la misma clase.
+- perdidas: inscripciones confirmadas que no están en el estado final.
+- fantasma: inscripciones en el estado final que ya se habían dado de baja
+  o que pertenecen a un miembro eliminado.
+- revividos: miembros eliminados que siguen en `miembros.csv`.
+
+Cada trabajador opera sobre su propio grupo de miembros, así que el estado
+esperado de cada miembro se deduce sin ambigüedad de las operaciones que ese
+trabajador vio confirmadas; las clases (y por lo tanto los archivos y los
+cupos) sí se comparten.
+
+Uso:
+
+    python carga.py [--trabajadores 8] [--operaciones 200] [--modo hilos]
+                    [--mezcla 70,25,5] [--particionado] [--json]
+"""
+
+import argparse
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+import crud
+import datos
+import particiones
+
+console = Console()
+
+OPERACIONES = ("inscribir", "baja", "eliminar")
+PERCENTILES = (50, 95, 99)
+
+CONFIG_POR_DEFECTO: Dict[str, Any] = {
+    "trabajadores": 4,
+    "operaciones": 200,
+    "modo": "procesos",
+    "mezcla": (70, 25, 5),
+    "miembros": 200,
+    "clases": 10,
+    "cupo": 15,
+    "particionado": False,
+    "semilla": 0,
+}
+
+
+def preparar_datos(directorio: str, config: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Crea los archivos de datos iniciales (sin inscripciones).
+
+    :return: Rutas {miembros, clases, inscripciones}.
+    """
+    rutas = {
+        "miembros": os.path.join(directorio, "miembros.csv"),
+        "clases": os.path.join(directorio, "clases.csv"),
+        "inscripciones": os.path.join(directorio, "inscripciones.json"),
+    }
+    datos.inicializar_archivo(rutas["miembros"])
+    datos.inicializar_archivo(rutas["clases"])
+    datos.guardar_datos(
+        rutas["miembros"],
+        [
+            {
+                "id_miembro": str(n),
+                "nombre": f"Miembro {n}",
+                "tipo_suscripcion": "Mensual",
+            }
+            for n in range(1, config["miembros"] + 1)
+        ],
+    )
+    datos.guardar_datos(
+        rutas["clases"],
+        [
+            {
+                "id_clase": str(n),
+                "nombre_clase": f"Clase {n}",
+                "instructor": "Carga",
+                "cupo_maximo": str(config["cupo"]),
+            }
+            for n in range(1, config["clases"] + 1)
+        ],
+    )
+    if config["particionado"]:
+        rutas["inscripciones"] = os.path.join(directorio, "inscripciones")
+        particiones.crear_almacen(rutas["inscripciones"])
+    else:
+        datos.guardar_datos(rutas["inscripciones"], [])
+    return rutas
+
+
+def _elegir_operacion(
+    rng: random.Random, mezcla: Tuple[int, ...], inscritas: Set[Tuple[str, str]]
+) -> str:
+    operacion = rng.choices(OPERACIONES, weights=mezcla)[0]
+    # Sin inscripciones propias no hay nada que dar de baja.
+    if operacion == "baja" and not inscritas:
+        return "inscribir"
+    return operacion
+
+
+def _ejecutar(
+    operacion: str,
+    rutas: Dict[str, str],
+    objetivo: Tuple[str, str],
+) -> bool:
+    id_miembro, id_clase = objetivo
+    if operacion == "inscribir":
+        ok, _ = crud.inscribir_miembro_en_clase(
+            rutas["inscripciones"],
+            rutas["clases"],
+            id_miembro,
+            id_clase,
+            rutas["miembros"],
+        )
+        return ok
+    if operacion == "baja":
+        return crud.dar_baja_miembro_de_clase(
+            rutas["inscripciones"], id_miembro, id_clase
+        )
+    return crud.eliminar_miembro(rutas["miembros"], id_miembro, rutas["inscripciones"])
+
+
+def _trabajador(tarea: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ejecuta las operaciones de un trabajador sobre sus propios miembros.
+
+    :return: {latencias: {op: [ms]}, confirmadas, errores, esperadas,
+        eliminados}.
+    """
+    rng = random.Random(tarea["semilla"])
+    rutas = tarea["rutas"]
+    vivos = list(tarea["miembros"])
+    inscritas: Set[Tuple[str, str]] = set()
+    eliminados: List[str] = []
+    resultado: Dict[str, Any] = {
+        "latencias": {op: [] for op in OPERACIONES},
+        "confirmadas": dict.fromkeys(OPERACIONES, 0),
+        "errores": [],
+    }
+
+    for _ in range(tarea["operaciones"]):
+        if not vivos:
+            break
+        operacion = _elegir_operacion(rng, tarea["mezcla"], inscritas)
+        if operacion == "inscribir":
+            objetivo = (rng.choice(vivos), rng.choice(tarea["clases"]))
+        elif operacion == "baja":
+            objetivo = rng.choice(sorted(inscritas))
+        else:
+            objetivo = (rng.choice(vivos), "")
+
+        inicio = time.perf_counter()
+        try:
+            ok = _ejecutar(operacion, rutas, objetivo)
+        except Exception as error:
+            resultado["errores"].append(f"{operacion}: {error!r}")
+            continue
+        finally:
+            resultado["latencias"][operacion].append(
+                (time.perf_counter() - inicio) * 1000
+            )
+
+        if not ok:
+            continue
+        resultado["confirmadas"][operacion] += 1
+        if operacion == "inscribir":
+            inscritas.add(objetivo)
+        elif operacion == "baja":
+            inscritas.discard(objetivo)
+        else:
+            vivos.remove(objetivo[0])
+            eliminados.append(objetivo[0])
+            inscritas = {i for i in inscritas if i[0] != objetivo[0]}
+
+    resultado["esperadas"] = sorted(inscritas)
+    resultado["eliminados"] = eliminados
+    return resultado
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil `p` (0-100) por rango más cercano; 0.0 si no hay valores."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    rango = max(math.ceil(p / 100 * len(ordenados)) - 1, 0)
+    return ordenados[min(rango, len(ordenados) - 1)]
+
+
+def verificar_invariantes(
+    rutas: Dict[str, str],
+    esperadas: Set[Tuple[str, str]],
+    eliminados: Set[str],
+) -> Dict[str, List[Any]]:
+    """
+    Compara el estado final de los archivos con el esperado.
+
+    :param esperadas: Pares (id_miembro, id_clase) que deberían existir.
+    :param eliminados: Miembros que se eliminaron con éxito.
+    :return: {sobrecupo, duplicadas, perdidas, fantasma, revividos}; cada lista
+        vacía indica que el invariante se cumple.
+    """
+    datos.limpiar_cache()
+    cupos = {
+        c["id_clase"]: int(c.get("cupo_maximo") or 0)
+        for c in datos.cargar_datos(rutas["clases"])
+    }
+    conteo: Dict[Tuple[str, str], int] = {}
+    por_clase: Dict[str, int] = {}
+    for insc in particiones.iterar_inscripciones(rutas["inscripciones"]):
+        par = (str(insc.get("id_miembro")), str(insc.get("id_clase")))
+        conteo[par] = conteo.get(par, 0) + 1
+        por_clase[par[1]] = por_clase.get(par[1], 0) + 1
+
+    ids_miembros = {m["id_miembro"] for m in datos.cargar_datos(rutas["miembros"])}
+    return {
+        "sobrecupo": sorted(
+            (id_clase, total, cupos.get(id_clase, 0))
+            for id_clase, total in por_clase.items()
+            if total > cupos.get(id_clase, 0)
+        ),
+        "duplicadas": sorted(par for par, veces in conteo.items() if veces > 1),
+        "perdidas": sorted(esperadas - conteo.keys()),
+        "fantasma": sorted(conteo.keys() - esperadas),
+        "revividos": sorted(eliminados & ids_miembros),
+    }
+
+
+def ejecutar_carga(
+    directorio: str, config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta una prueba de carga sobre `directorio` (que se llena desde cero).
+
+    :param config: Sobrescribe valores de `CONFIG_POR_DEFECTO`.
+    :return: Reporte con duración, operaciones por segundo, latencias por
+        operación (percentiles en ms), errores y violaciones de invariantes.
+    """
+    config = {**CONFIG_POR_DEFECTO, **(config or {})}
+    rutas = preparar_datos(directorio, config)
+    ids_miembros = [str(n) for n in range(1, config["miembros"] + 1)]
+    ids_clases = [str(n) for n in range(1, config["clases"] + 1)]
+    n = config["trabajadores"]
+    tareas = [
+        {
+            "rutas": rutas,
+            "miembros": ids_miembros[i::n],
+            "clases": ids_clases,
+            "operaciones": config["operaciones"],
+            "mezcla": tuple(config["mezcla"]),
+            "semilla": config["semilla"] + i,
+        }
+        for i in range(n)
+    ]
+
+    pool_cls = (
+        ProcessPoolExecutor if config["modo"] == "procesos" else (ThreadPoolExecutor)
+    )
+    inicio = time.perf_counter()
+    with pool_cls(max_workers=n) as pool:
+        resultados = list(pool.map(_trabajador, tareas))
+    duracion = time.perf_counter() - inicio
+
+    latencias: Dict[str, List[float]] = {op: [] for op in OPERACIONES}
+    confirmadas = dict.fromkeys(OPERACIONES, 0)
+    esperadas: Set[Tuple[str, str]] = set()
+    eliminados: Set[str] = set()
+    errores: List[str] = []
+    for resultado in resultados:
+        for op in OPERACIONES:
+            latencias[op].extend(resultado["latencias"][op])
+            confirmadas[op] += resultado["confirmadas"][op]
+        esperadas.update(tuple(par) for par in resultado["esperadas"])
+        eliminados.update(resultado["eliminados"])
+        errores.extend(resultado["errores"])
+
+    total = sum(len(v) for v in latencias.values())
+    return {
+        "config": config,
+        "duracion_s": duracion,
+        "operaciones": total,
+        "ops_por_segundo": total / duracion if duracion else 0.0,
+        "latencias": {
+            op: {
+                "total": len(valores),
+                "confirmadas": confirmadas[op],
+                **{f"p{p}": percentil(valores, p) for p in PERCENTILES},
+            }
+            for op, valores in latencias.items()
+        },
+        "errores": errores,
+        "violaciones": verificar_invariantes(rutas, esperadas, eliminados),
+    }
+
+
+def mostrar_reporte(reporte: Dict[str, Any]) -> None:
+    """Muestra el reporte de una prueba de carga."""
+    config = reporte["config"]
+    console.print(
+        f"[cyan]{config['trabajadores']} trabajadores ({config['modo']}), "
+        f"{reporte['operaciones']} operaciones en {reporte['duracion_s']:.2f} s: "
+        f"[bold]{reporte['ops_por_segundo']:.0f} ops/s[/bold][/cyan]"
+    )
+
+    tabla = Table(title="LATENCIAS (ms)", style="cyan")
+    tabla.add_column("Operación", style="yellow")
+    tabla.add_column("Total", justify="right")
+    tabla.add_column("Confirmadas", justify="right")
+    for p in PERCENTILES:
+        tabla.add_column(f"p{p}", justify="right")
+    for op, valores in reporte["latencias"].items():
+        tabla.add_row(
+            op,
+            str(valores["total"]),
+            str(valores["confirmadas"]),
+            *(f"{valores[f'p{p}']:.2f}" for p in PERCENTILES),
+        )
+    console.print(tabla)
+
+    tabla = Table(title="INVARIANTES", style="cyan")
+    tabla.add_column("Invariante", style="yellow")
+    tabla.add_column("Violaciones", justify="right")
+    tabla.add_column("Ejemplos")
+    for nombre, casos in reporte["violaciones"].items():
+        color = "green" if not casos else "red"
+        tabla.add_row(
+            nombre, f"[{color}]{len(casos)}[/{color}]", ", ".join(map(str, casos[:3]))
+        )
+    console.print(tabla)
+    if reporte["errores"]:
+        console.print(
+            f"[red]{len(reporte['errores'])} operaciones fallaron con excepción; "
+            f"p. ej. {reporte['errores'][0]}[/red]"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga de inscripciones.")
+    parser.add_argument("--trabajadores", type=int, default=4)
+    parser.add_argument("--operaciones", type=int, default=200, help="Por trabajador")
+    parser.add_argument("--modo", choices=["procesos", "hilos"], default="procesos")
+    parser.add_argument(
+        "--mezcla", default="70,25,5", help="Pesos de inscribir,baja,eliminar"
+    )
+    parser.add_argument("--miembros", type=int, default=200)
+    parser.add_argument("--clases", type=int, default=10)
+    parser.add_argument("--cupo", type=int, default=15)
+    parser.add_argument("--particionado", action="store_true")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args()
+
+    mezcla = tuple(int(peso) for peso in args.mezcla.split(","))
+    if len(mezcla) != len(OPERACIONES):
+        parser.error("--mezcla necesita tres pesos: inscribir,baja,eliminar")
+    config = {
+        "trabajadores": args.trabajadores,
+        "operaciones": args.operaciones,
+        "modo": args.modo,
+        "mezcla": mezcla,
+        "miembros": args.miembros,
+        "clases": args.clases,
+        "cupo": args.cupo,
+        "particionado": args.particionado,
+        "semilla": args.semilla,
+    }
+    with tempfile.TemporaryDirectory(prefix="carga_") as directorio:
+        reporte = ejecutar_carga(directorio, config)
+
+    if args.json:
+        console.print_json(data=reporte)
+    else:
+        mostrar_reporte(reporte)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,20 +7,25 @@ y gestión de Inscripciones).
 """
 
 import csv
-import json
 import os
+from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
 import datos
+import horarios
+import particiones
+import vencimientos
 
 console = Console()
 
-INFO_DIR = "info"
+# Directorio de datos por defecto; puede cambiarse con la variable de entorno
+# GYM_INFO_DIR para servir a otra sede.
+INFO_DIR = os.environ.get("GYM_INFO_DIR", "info")
 CLASES_FILE = os.path.join(INFO_DIR, "clases.csv")
-INSCRIPCIONES_FILE = os.path.join(INFO_DIR, "inscripciones.json")
+INSCRIPCIONES_FILE = particiones.ruta_inscripciones(INFO_DIR)
 
 VALID_TIPOS_SUSCRIPCION = ("Mensual", "Anual")
 
@@ -46,10 +51,16 @@ def generar_nuevo_id(entidad: str, lista: List[Dict[str, Any]]) -> str:
 
 
 def crear_miembro(
-    filepath: str, nombre: str, tipo_suscripcion: str
+    filepath: str,
+    nombre: str,
+    tipo_suscripcion: str,
+    fecha_inicio: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     (CREATE) Agrega un nuevo miembro.
+
+    La suscripción empieza en `fecha_inicio` (ISO, por defecto hoy) y su
+    vencimiento se calcula según el tipo (ver vencimientos.py).
     """
     miembros = datos.cargar_datos(filepath)
 
@@ -61,19 +72,40 @@ def crear_miembro(
         console.print(f"[red]Tipo de suscripción inválido: {tipo_suscripcion}[/red]")
         return None
 
+    inicio = vencimientos.leer_fecha(fecha_inicio) if fecha_inicio else date.today()
+    if not inicio:
+        console.print(f"[red]Fecha de inicio inválida: {fecha_inicio}[/red]")
+        return None
+
     nuevo_id = generar_nuevo_id("miembro", miembros)
+    firma_previa = datos.firma_archivo(filepath)
 
     nuevo_miembro = {
         "id_miembro": nuevo_id,
         "nombre": nombre.strip(),
         "tipo_suscripcion": tipo_suscripcion,
+        **_fechas_suscripcion(inicio, tipo_suscripcion),
     }
 
     miembros.append(nuevo_miembro)
     datos.guardar_datos(filepath, miembros)
+    vencimientos.registrar_miembro(filepath, nuevo_miembro, firma_previa)
     return nuevo_miembro
 
 
+def _fechas_suscripcion(inicio: date, tipo_suscripcion: str) -> Dict[str, str]:
+    vencimiento = vencimientos.calcular_vencimiento(inicio, tipo_suscripcion)
+    return {
+        "fecha_inicio": inicio.isoformat(),
+        "fecha_vencimiento": vencimiento.isoformat(),
+        "activo": (
+            vencimientos.ACTIVO
+            if vencimiento >= date.today()
+            else vencimientos.INACTIVO
+        ),
+    }
+
+
 def leer_todos_los_miembros(filepath: str) -> List[Dict[str, Any]]:
     """(READ) Obtiene la lista completa de miembros."""
     return datos.cargar_datos(filepath)
@@ -81,17 +113,19 @@ def leer_todos_los_miembros(filepath: str) -> List[Dict[str, Any]]:
 
 def buscar_miembro_por_id(filepath: str, id_miembro: str) -> Optional[Dict[str, Any]]:
     """Busca un miembro específico por su ID."""
-    miembros = datos.cargar_datos(filepath)
-    for miembro in miembros:
-        if miembro.get("id_miembro") == id_miembro:
-            return miembro
-    return None
+    miembro = datos.indexar(filepath, "id_miembro").get(id_miembro)
+    return dict(miembro) if miembro else None
 
 
 def actualizar_miembro(
     filepath: str, id_miembro: str, datos_nuevos: Dict[str, Any]
 ) -> Optional[Dict[str, Any]]:
-    """(UPDATE) Modifica los datos de un miembro existente."""
+    """
+    (UPDATE) Modifica los datos de un miembro existente.
+
+    Si cambia el tipo de suscripción o la fecha de inicio (p. ej. una
+    renovación), el vencimiento y el estado activo se recalculan.
+    """
     miembros = datos.cargar_datos(filepath)
 
     for i, miembro in enumerate(miembros):
@@ -102,9 +136,21 @@ def actualizar_miembro(
                     console.print(f"[red]Tipo de suscripción inválido: {tipo}[/red]")
                     return None
 
+            if "fecha_inicio" in datos_nuevos or "tipo_suscripcion" in datos_nuevos:
+                texto = datos_nuevos.get("fecha_inicio", miembro.get("fecha_inicio"))
+                inicio = vencimientos.leer_fecha(texto) if texto else date.today()
+                if not inicio:
+                    console.print(f"[red]Fecha de inicio inválida: {texto}[/red]")
+                    return None
+                tipo = datos_nuevos.get("tipo_suscripcion", miembro["tipo_suscripcion"])
+                if tipo in VALID_TIPOS_SUSCRIPCION:
+                    datos_nuevos = {**datos_nuevos, **_fechas_suscripcion(inicio, tipo)}
+
             miembro.update(datos_nuevos)
             miembros[i] = {k: miembro.get(k, "") for k in datos.CAMPOS_MIEMBROS}
+            firma_previa = datos.firma_archivo(filepath)
             datos.guardar_datos(filepath, miembros)
+            vencimientos.registrar_miembro(filepath, miembros[i], firma_previa)
             return miembros[i]
 
     return None
@@ -121,15 +167,23 @@ def eliminar_miembro(
     miembros = [m for m in miembros if m.get("id_miembro") != id_miembro]
 
     if len(miembros) < miembros_iniciales:
+        firma_previa = datos.firma_archivo(filepath_miembros)
         datos.guardar_datos(filepath_miembros, miembros)
+        vencimientos.registrar_eliminacion(filepath_miembros, id_miembro, firma_previa)
 
         # Eliminar sus inscripciones
-        if os.path.exists(filepath_inscripciones):
+        firma_previa = datos.firma_archivo(filepath_inscripciones)
+        if particiones.es_particionado(filepath_inscripciones):
+            particiones.eliminar_inscripciones_de_miembro(
+                filepath_inscripciones, id_miembro
+            )
+        elif os.path.exists(filepath_inscripciones):
             inscripciones = datos.cargar_datos(filepath_inscripciones)
             inscripciones = [
                 i for i in inscripciones if i.get("id_miembro") != id_miembro
             ]
             datos.guardar_datos(filepath_inscripciones, inscripciones)
+        horarios.registrar_eliminacion(filepath_inscripciones, id_miembro, firma_previa)
 
         return True
 
@@ -137,9 +191,18 @@ def eliminar_miembro(
 
 
 def crear_clase(
-    filepath: str, nombre_clase: str, instructor: str, cupo_maximo: int
+    filepath: str,
+    nombre_clase: str,
+    instructor: str,
+    cupo_maximo: int,
+    horario: Optional[Dict[str, str]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """(CREATE) Agrega una nueva clase."""
+    """
+    (CREATE) Agrega una nueva clase.
+
+    `horario` es opcional: {dia_semana, hora_inicio, hora_fin, sala}. Si se
+    indica, se rechaza la clase cuando la sala ya está ocupada en ese horario.
+    """
     clases = datos.cargar_datos(filepath)
 
     if not nombre_clase.strip() or not instructor.strip():
@@ -152,6 +215,19 @@ def crear_clase(
         console.print("[red]El cupo máximo debe ser un número positivo.[/red]")
         return None
 
+    if horario:
+        error = horarios.validar_horario(horario)
+        if error:
+            console.print(f"[red]{error}[/red]")
+            return None
+        ocupada_por = horarios.choque_sala(filepath, horario)
+        if ocupada_por:
+            console.print(
+                f"[red]La sala '{horario['sala']}' ya está ocupada en ese horario "
+                f"(clase {ocupada_por}).[/red]"
+            )
+            return None
+
     nuevo_id = generar_nuevo_id("clase", clases)
     nueva_clase = {
         "id_clase": nuevo_id,
@@ -159,6 +235,8 @@ def crear_clase(
         "instructor": instructor.strip(),
         "cupo_maximo": str(cupo_maximo),
     }
+    for campo in datos.CAMPOS_HORARIO:
+        nueva_clase[campo] = (horario or {}).get(campo, "").strip()
 
     clases.append(nueva_clase)
     datos.guardar_datos(filepath, clases)
@@ -172,18 +250,40 @@ def leer_todas_las_clases(filepath: str) -> List[Dict[str, Any]]:
 
 def buscar_clase_por_id(filepath: str, id_clase: str) -> Optional[Dict[str, Any]]:
     """Busca una clase específica por su ID."""
-    clases = datos.cargar_datos(filepath)
-    for clase in clases:
-        if clase.get("id_clase") == id_clase:
-            return clase
-    return None
+    clase = datos.indexar(filepath, "id_clase").get(id_clase)
+    return dict(clase) if clase else None
 
 
 def inscribir_miembro_en_clase(
-    filepath_inscripciones: str, filepath_clases: str, id_miembro: str, id_clase: str
+    filepath_inscripciones: str,
+    filepath_clases: str,
+    id_miembro: str,
+    id_clase: str,
+    filepath_miembros: str,
 ) -> Tuple[bool, str]:
-    """Inscribe a un miembro en una clase."""
-    inscripciones = datos.cargar_datos(filepath_inscripciones)
+    """
+    Inscribe a un miembro en una clase.
+
+    Se rechaza a los miembros con la suscripción vencida: los marcados como
+    inactivos y los que vencieron aunque el barrido aún no los haya
+    desactivado (ver `vencimientos.esta_vigente`).
+    """
+    miembro = (
+        buscar_miembro_por_id(filepath_miembros, id_miembro)
+        if os.path.exists(filepath_miembros)
+        else None
+    )
+    if miembro and not vencimientos.esta_vigente(miembro):
+        return (
+            False,
+            f"Error: La suscripción del miembro '{id_miembro}' está vencida.",
+        )
+
+    particionado = particiones.es_particionado(filepath_inscripciones)
+    if particionado:
+        inscripciones = particiones.cargar_particion(filepath_inscripciones, id_clase)
+    else:
+        inscripciones = datos.cargar_datos(filepath_inscripciones)
     clase = buscar_clase_por_id(filepath_clases, id_clase)
 
     if not clase:
@@ -206,9 +306,26 @@ def inscribir_miembro_en_clase(
             f"alcanzó su cupo máximo ({cupo_maximo}).",
         )
 
-    nueva_inscripcion = {"id_miembro": id_miembro, "id_clase": id_clase}
-    inscripciones.append(nueva_inscripcion)
-    datos.guardar_datos(filepath_inscripciones, inscripciones)
+    choque = horarios.choque_miembro(
+        filepath_inscripciones, filepath_clases, id_miembro, clase
+    )
+    if choque:
+        return (
+            False,
+            f"Error: El horario de '{clase['nombre_clase']}' choca con la clase "
+            f"'{choque}' del miembro '{id_miembro}'.",
+        )
+
+    firma_previa = datos.firma_archivo(filepath_inscripciones)
+    if particionado:
+        particiones.agregar_inscripcion(filepath_inscripciones, id_miembro, id_clase)
+    else:
+        nueva_inscripcion = {"id_miembro": id_miembro, "id_clase": id_clase}
+        inscripciones.append(nueva_inscripcion)
+        datos.guardar_datos(filepath_inscripciones, inscripciones)
+    horarios.registrar_inscripcion(
+        filepath_inscripciones, filepath_clases, id_miembro, clase, firma_previa
+    )
     return (
         True,
         f"¡Inscripción exitosa! Miembro {id_miembro} en clase {clase['nombre_clase']}.",
@@ -217,25 +334,34 @@ def inscribir_miembro_en_clase(
 
 def dar_baja_miembro_de_clase(filepath: str, id_miembro: str, id_clase: str) -> bool:
     """Da de baja a un miembro de una clase."""
-    inscripciones = datos.cargar_datos(filepath)
-    inscripciones_iniciales = len(inscripciones)
-    inscripciones = [
-        i
-        for i in inscripciones
-        if not (i.get("id_miembro") == id_miembro and i.get("id_clase") == id_clase)
-    ]
-
-    if len(inscripciones) < inscripciones_iniciales:
-        datos.guardar_datos(filepath, inscripciones)
-        return True
-    return False
+    firma_previa = datos.firma_archivo(filepath)
+    if particiones.es_particionado(filepath):
+        eliminada = particiones.quitar_inscripcion(filepath, id_miembro, id_clase)
+    else:
+        inscripciones = datos.cargar_datos(filepath)
+        inscripciones_iniciales = len(inscripciones)
+        inscripciones = [
+            i
+            for i in inscripciones
+            if not (i.get("id_miembro") == id_miembro and i.get("id_clase") == id_clase)
+        ]
+        eliminada = len(inscripciones) < inscripciones_iniciales
+        if eliminada:
+            datos.guardar_datos(filepath, inscripciones)
+
+    if eliminada:
+        horarios.registrar_baja(filepath, id_miembro, id_clase, firma_previa)
+    return eliminada
 
 
 def listar_miembros_inscritos_en_clase(
     filepath_inscripciones: str, filepath_miembros: str, id_clase: str
 ) -> List[Dict[str, Any]]:
     """Lista los miembros inscritos en una clase específica."""
-    inscripciones = datos.cargar_datos(filepath_inscripciones)
+    if particiones.es_particionado(filepath_inscripciones):
+        inscripciones = particiones.cargar_particion(filepath_inscripciones, id_clase)
+    else:
+        inscripciones = datos.cargar_datos(filepath_inscripciones)
     miembros_todos = datos.cargar_datos(filepath_miembros)
     ids_inscritos = [
         i["id_miembro"] for i in inscripciones if i["id_clase"] == id_clase
@@ -247,25 +373,35 @@ def listar_clases_inscritas_por_miembro(
     filepath_inscripciones: str, filepath_clases: str, id_miembro: str
 ) -> List[Dict[str, Any]]:
     """Lista todas las clases en las que está inscrito un miembro."""
-    inscripciones = datos.cargar_datos(filepath_inscripciones)
     clases_todas = datos.cargar_datos(filepath_clases)
-    ids_clases = [i["id_clase"] for i in inscripciones if i["id_miembro"] == id_miembro]
+    if particiones.es_particionado(filepath_inscripciones):
+        ids_clases = particiones.clases_de_miembro(filepath_inscripciones, id_miembro)
+    else:
+        inscripciones = datos.cargar_datos(filepath_inscripciones)
+        ids_clases = [
+            i["id_clase"] for i in inscripciones if i["id_miembro"] == id_miembro
+        ]
     return [c for c in clases_todas if c.get("id_clase") in ids_clases]
 
 
-def ver_cupos_disponibles():
+def ver_cupos_disponibles(
+    filepath_clases: str = CLASES_FILE,
+    filepath_inscripciones: str = INSCRIPCIONES_FILE,
+):
     """Muestra los cupos disponibles por clase."""
-    if not os.path.exists(CLASES_FILE):
+    if not os.path.exists(filepath_clases):
         console.print("[red]El archivo de clases no existe.[/red]")
         return
 
-    if not os.path.exists(INSCRIPCIONES_FILE):
+    if not particiones.es_particionado(filepath_inscripciones) and not os.path.exists(
+        filepath_inscripciones
+    ):
         console.print("[red]El archivo de inscripciones no existe.[/red]")
         return
 
     clases = []
-    c_column=4
-    with open(CLASES_FILE, "r", encoding="utf-8") as f:
+    c_column = 4
+    with open(filepath_clases, "r", encoding="utf-8") as f:
         reader = csv.reader(f)
         next(reader, None)
         for fila in reader:
@@ -290,11 +426,9 @@ def ver_cupos_disponibles():
                 }
             )
 
-    try:
-        with open(INSCRIPCIONES_FILE, "r", encoding="utf-8") as f:
-            inscripciones = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        inscripciones = []
+    inscripciones = particiones.iterar_inscripciones(
+        filepath_inscripciones, tolerante=True
+    )
 
     inscritos_por_clase = {}
     for insc in inscripciones:
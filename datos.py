@@ -8,10 +8,29 @@ No contiene lógica de negocio, solo operaciones de I/O.
 import csv
 import json
 import os
-from typing import Any, Dict, List
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 
-CAMPOS_MIEMBROS = ["id_miembro", "nombre", "tipo_suscripcion"]
-CAMPOS_CLASES = ["id_clase", "nombre_clase", "instructor", "cupo_maximo"]
+# Campos con las fechas de la suscripción (ver vencimientos.py). Los archivos
+# anteriores no los tienen; se completan al volver a guardar.
+CAMPOS_SUSCRIPCION = ["fecha_inicio", "fecha_vencimiento", "activo"]
+CAMPOS_MIEMBROS = ["id_miembro", "nombre", "tipo_suscripcion"] + CAMPOS_SUSCRIPCION
+# Campos opcionales con el horario semanal de la clase (ver horarios.py).
+CAMPOS_HORARIO = ["dia_semana", "hora_inicio", "hora_fin", "sala"]
+CAMPOS_CLASES = ["id_clase", "nombre_clase", "instructor", "cupo_maximo"] + (
+    CAMPOS_HORARIO
+)
+
+# Permisos para los archivos escritos vía archivo temporal (mkstemp usa 0600).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Caché de contenido por ruta: {"firma", "filas", "indices"}. Se comparte entre
+# hilos (ver arranque.py), por eso se protege con un lock.
+_cache: Dict[str, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
 
 
 def inicializar_archivo(filepath: str) -> None:
@@ -55,6 +74,24 @@ def inicializar_archivos(*filepaths: str) -> None:
         inicializar_archivo(filepath)
 
 
+def _leer_archivo(filepath: str) -> List[Dict[str, Any]]:
+    try:
+        if filepath.endswith(".csv"):
+            with open(filepath, mode="r", newline="", encoding="utf-8") as csv_file:
+                lector = csv.DictReader(csv_file)
+                return [dict(row) for row in lector]
+        elif filepath.endswith(".json"):
+            with open(filepath, mode="r", encoding="utf-8") as json_file:
+                datos = json.load(json_file)
+                return datos if isinstance(datos, list) else []
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def _copiar_filas(filas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [dict(f) if isinstance(f, dict) else f for f in filas]
+
+
 def cargar_datos(filepath: str) -> List[Dict[str, Any]]:
     """
     Carga los datos desde un archivo y los retorna como una lista de diccionarios.
@@ -62,30 +99,202 @@ def cargar_datos(filepath: str) -> List[Dict[str, Any]]:
     Asegura la inicialización del archivo antes de intentar la lectura.
     Retorna una lista vacía `[]` si el archivo no existe o está vacío/corrupto.
 
+    El contenido leído se guarda en una caché en memoria asociada a la firma
+    del archivo (ver `firma_archivo`); mientras el archivo no cambie se evita
+    volver a parsearlo. Siempre se retorna una copia, que el llamador puede
+    modificar libremente.
+
     :param filepath: La ruta completa al archivo de datos.
     :type filepath: str
     :return: Lista de diccionarios que representan los datos cargados.
     :rtype: List[Dict[str, Any]]
     """
     inicializar_archivo(filepath)
+    if not filepath.endswith((".csv", ".json")):
+        return _leer_archivo(filepath)
+
+    # La firma se toma antes de leer: si el archivo cambia durante la lectura,
+    # la entrada quedará con una firma vieja y se releerá la próxima vez.
+    firma = firma_archivo(filepath)
+    with _cache_lock:
+        en_cache = _cache.get(filepath)
+    if en_cache is not None and en_cache["firma"] == firma:
+        return _copiar_filas(en_cache["filas"])
 
+    filas = _leer_archivo(filepath)
+    with _cache_lock:
+        _cache[filepath] = {"firma": firma, "filas": filas, "indices": {}}
+    return _copiar_filas(filas)
+
+
+def indexar(filepath: str, clave: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Retorna un índice {valor de `clave`: fila} de un archivo de datos.
+
+    El índice se construye una vez por versión del archivo y se guarda junto
+    al contenido en caché. Si hay valores repetidos se conserva la primera
+    fila, igual que una búsqueda lineal. Las filas del índice no deben
+    modificarse.
+
+    :param filepath: La ruta completa al archivo de datos.
+    :type filepath: str
+    :param clave: Campo por el que se indexa (p. ej. 'id_miembro').
+    :type clave: str
+    :return: Diccionario valor -> fila.
+    :rtype: Dict[str, Dict[str, Any]]
+    """
+    cargar_datos(filepath)
+    with _cache_lock:
+        entrada = _cache.get(filepath)
+        if entrada is None:
+            return {}
+        if clave not in entrada["indices"]:
+            indice: Dict[str, Dict[str, Any]] = {}
+            for fila in entrada["filas"]:
+                if isinstance(fila, dict) and clave in fila:
+                    indice.setdefault(fila[clave], fila)
+            entrada["indices"][clave] = indice
+        return entrada["indices"][clave]
+
+
+def limpiar_cache() -> None:
+    """Descarta todo el contenido en caché."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def iterar_json(filepath: str, tam_bloque: int = 65536) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los elementos de una lista JSON sin cargar el archivo completo.
+
+    Lee el archivo en bloques de `tam_bloque` caracteres y decodifica un
+    elemento a la vez, por lo que la memoria usada depende del tamaño de un
+    elemento y no del número de elementos. Si el archivo no existe o no es una
+    lista, el recorrido termina sin elementos (como `cargar_datos`); a
+    diferencia de este, un archivo corrupto produce un error en lugar de
+    recortar la lista en silencio.
+
+    :param filepath: La ruta completa al archivo JSON.
+    :type filepath: str
+    :param tam_bloque: Caracteres leídos en cada lectura.
+    :type tam_bloque: int
+    :return: Iterador sobre los elementos de la lista.
+    :rtype: Iterator[Dict[str, Any]]
+    :raises json.JSONDecodeError: Si el contenido de la lista no es JSON válido.
+    """
+    decoder = json.JSONDecoder()
     try:
-        if filepath.endswith(".csv"):
-            with open(filepath, mode="r", newline="", encoding="utf-8") as csv_file:
-                lector = csv.DictReader(csv_file)
-                return [dict(row) for row in lector]
-        elif filepath.endswith(".json"):
-            with open(filepath, mode="r", encoding="utf-8") as json_file:
-                datos = json.load(json_file)
-                return datos if isinstance(datos, list) else []
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
+        json_file = open(filepath, mode="r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+
+    with json_file:
+        buffer = ""
+        pos = 0
+        dentro_de_lista = False
+        fin_archivo = False
+        # Error de la última decodificación incompleta, relativo a `pos`.
+        error_previo = None
+
+        def leer_mas() -> None:
+            nonlocal buffer, pos, fin_archivo
+            bloque = json_file.read(tam_bloque)
+            fin_archivo = not bloque
+            buffer = buffer[pos:] + bloque
+            pos = 0
+
+        while True:
+            while pos < len(buffer) and (
+                buffer[pos].isspace() or (dentro_de_lista and buffer[pos] == ",")
+            ):
+                pos += 1
+
+            if pos >= len(buffer):
+                if fin_archivo:
+                    if dentro_de_lista:
+                        raise json.JSONDecodeError("Lista sin cerrar", buffer, pos)
+                    return
+                leer_mas()
+                continue
+
+            if not dentro_de_lista:
+                if buffer[pos] != "[":
+                    return
+                dentro_de_lista = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                elemento, fin = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                # Si con más datos el error se repite en el mismo lugar, el
+                # archivo está corrupto (una cadena larga sin cerrar es la
+                # excepción: su error siempre apunta al inicio).
+                actual = (error.msg, error.pos - pos)
+                if fin_archivo or (
+                    actual == error_previo
+                    and not error.msg.startswith("Unterminated string")
+                ):
+                    raise
+                error_previo = actual
+                leer_mas()
+                continue
+
+            # Un escalar que toca el final del buffer puede seguir en el
+            # siguiente bloque (p. ej. un número partido).
+            if fin == len(buffer) and not fin_archivo:
+                leer_mas()
+                continue
+            error_previo = None
+            pos = fin
+            yield elemento
+
+
+@contextmanager
+def escritura_atomica(
+    filepath: str, newline: Optional[str] = None, binario: bool = False
+) -> Iterator[IO[Any]]:
+    """
+    Abre un archivo temporal que reemplaza a `filepath` al cerrarse sin error.
+
+    Quien lea el archivo (otro proceso, un respaldo) ve siempre la versión
+    anterior completa o la nueva completa, nunca una escritura a medias.
+
+    :param filepath: La ruta completa al archivo de datos.
+    :type filepath: str
+    :param newline: Igual que en `open` (usar "" para CSV).
+    :type newline: str
+    :param binario: Si es True, el archivo se abre en modo binario.
+    :type binario: bool
+    :return: Archivo abierto para escritura (de texto, salvo `binario`).
+    :rtype: Iterator[IO[Any]]
+    """
+    directorio = os.path.dirname(filepath) or "."
+    fd, temporal = tempfile.mkstemp(dir=directorio, prefix=".", suffix=".tmp")
+    try:
+        if binario:
+            archivo = os.fdopen(fd, mode="wb")
+        else:
+            archivo = os.fdopen(fd, mode="w", newline=newline, encoding="utf-8")
+        with archivo:
+            yield archivo
+        os.chmod(temporal, 0o666 & ~_UMASK)
+        os.replace(temporal, filepath)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
 
 
 def guardar_datos(filepath: str, datos: List[Dict[str, Any]]) -> None:
     """
     Guarda una lista de diccionarios en un archivo, sobrescribiendo el contenido.
 
+    La escritura es atómica (ver `escritura_atomica`).
+
     :param filepath: La ruta completa al archivo de datos.
     :type filepath: str
     :param datos: La lista de diccionarios a guardar.
@@ -100,10 +309,67 @@ def guardar_datos(filepath: str, datos: List[Dict[str, Any]]) -> None:
         campos = CAMPOS_CLASES
 
     if filepath.endswith(".csv"):
-        with open(filepath, mode="w", newline="", encoding="utf-8") as csv_file:
+        with escritura_atomica(filepath, newline="") as csv_file:
             writer = csv.DictWriter(csv_file, fieldnames=campos)
             writer.writeheader()
             writer.writerows(datos)
     elif filepath.endswith(".json"):
-        with open(filepath, mode="w", encoding="utf-8") as json_file:
+        with escritura_atomica(filepath) as json_file:
             json.dump(datos, json_file, indent=4)
+    else:
+        return
+
+    # Se actualiza la caché con lo recién escrito (tal como se leería del
+    # archivo) para que la siguiente lectura no tenga que parsearlo.
+    with _cache_lock:
+        if not isinstance(datos, list):
+            _cache.pop(filepath, None)
+            return
+        if filepath.endswith(".csv"):
+            filas = [
+                {c: "" if f.get(c) is None else str(f.get(c)) for c in campos}
+                for f in datos
+            ]
+        else:
+            filas = _copiar_filas(datos)
+        _cache[filepath] = {
+            "firma": firma_archivo(filepath),
+            "filas": filas,
+            "indices": {},
+        }
+
+
+def firma_archivo(filepath: str) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Retorna una firma barata (nombre, mtime_ns, tamaño) para detectar cambios.
+
+    Si la ruta es un directorio (p. ej. inscripciones particionadas), la firma
+    incluye cada archivo visible que contiene; se omiten los ocultos (como los
+    temporales de `escritura_atomica`) y los que desaparecen durante el
+    recorrido por una escritura concurrente. Un archivo inexistente tiene
+    firma vacía.
+
+    :param filepath: Ruta al archivo o directorio de datos.
+    :type filepath: str
+    :return: Tupla comparable que cambia cuando cambia el contenido.
+    :rtype: Tuple[Tuple[str, int, int], ...]
+    """
+    if os.path.isdir(filepath):
+        firmas = []
+        with os.scandir(filepath) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith("."):
+                    continue
+                try:
+                    if not entrada.is_file():
+                        continue
+                    estado = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                firmas.append((entrada.name, estado.st_mtime_ns, estado.st_size))
+        return tuple(sorted(firmas))
+    try:
+        estado = os.stat(filepath)
+    except FileNotFoundError:
+        return ()
+    return ((os.path.basename(filepath), estado.st_mtime_ns, estado.st_size),)
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Detección de Miembros Duplicados.
+
+Comparar todos los pares de miembros es cuadrático, así que los nombres se
+agrupan primero por claves de bloqueo (clave fonética y prefijo del primer y
+último token, y tokens fonéticos ordenados) y la comparación difusa solo se
+hace entre miembros que comparten bloque. Los bloques pueden repartirse en un
+pool de procesos.
+
+Incluye la fusión de dos miembros: las inscripciones del duplicado pasan al
+miembro que se conserva y el duplicado se elimina.
+
+Uso:
+
+    python duplicados.py [--umbral 0.85] [--procesos N]
+    python duplicados.py --fusionar ID_CONSERVAR ID_DUPLICADO
+"""
+
+import argparse
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Any, Dict, List, Set, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+import crud
+import datos
+import particiones
+
+console = Console()
+
+UMBRAL_SIMILITUD = 0.85
+LARGO_CLAVE = 4
+LARGO_PREFIJO = 3
+
+# Sustituciones fonéticas aproximadas para nombres en español.
+_REEMPLAZOS_FONETICOS = (
+    ("ll", "y"),
+    ("qu", "k"),
+    ("ch", "x"),
+    ("ce", "se"),
+    ("ci", "si"),
+    ("ge", "je"),
+    ("gi", "ji"),
+    ("h", ""),
+    ("v", "b"),
+    ("z", "s"),
+    ("c", "k"),
+    ("w", "u"),
+    ("i", "y"),
+)
+
+_cache_bloques: Dict[str, Tuple[Tuple, Dict[str, List[Tuple[str, str, str]]]]] = {}
+
+
+def normalizar(nombre: str) -> str:
+    """Pasa a minúsculas, quita tildes y deja solo letras separadas por espacio."""
+    sin_tildes = unicodedata.normalize("NFKD", nombre)
+    sin_tildes = "".join(c for c in sin_tildes if not unicodedata.combining(c))
+    return " ".join(re.findall(r"[a-zñ]+", sin_tildes.lower()))
+
+
+def clave_fonetica(token: str) -> str:
+    """Clave fonética aproximada de un token ya normalizado."""
+    clave = token
+    for origen, destino in _REEMPLAZOS_FONETICOS:
+        clave = clave.replace(origen, destino)
+    # Colapsa letras repetidas ("rr" -> "r").
+    clave = re.sub(r"(.)\1+", r"\1", clave)
+    return clave[:LARGO_CLAVE]
+
+
+def claves_bloqueo(nombre: str) -> Set[str]:
+    """Retorna las claves de bloqueo de un nombre."""
+    tokens = normalizar(nombre).split()
+    if not tokens:
+        return set()
+    primero, ultimo = tokens[0], tokens[-1]
+    foneticos = [clave_fonetica(t) for t in tokens]
+    return {
+        f"f:{foneticos[0]}|{foneticos[-1]}",
+        f"p:{primero[:LARGO_PREFIJO]}|{ultimo[:LARGO_PREFIJO]}",
+        "o:" + "|".join(sorted(foneticos)),
+    }
+
+
+def similitud(nombre_a: str, nombre_b: str) -> float:
+    """Similitud entre 0 y 1 de dos nombres normalizados."""
+    return SequenceMatcher(None, nombre_a, nombre_b).ratio()
+
+
+def _indice_bloques(filepath_miembros: str) -> Dict[str, List[Tuple[str, str, str]]]:
+    """
+    Agrupa los miembros por clave de bloqueo: {clave: [(id, normalizado,
+    nombre)]}. Se recalcula solo si cambió el archivo de miembros.
+    """
+    firma = datos.firma_archivo(filepath_miembros)
+    en_cache = _cache_bloques.get(filepath_miembros)
+    if en_cache and en_cache[0] == firma:
+        return en_cache[1]
+
+    bloques: Dict[str, List[Tuple[str, str, str]]] = {}
+    for miembro in datos.cargar_datos(filepath_miembros):
+        nombre = miembro.get("nombre") or ""
+        entrada = (miembro.get("id_miembro", ""), normalizar(nombre), nombre)
+        for clave in claves_bloqueo(nombre):
+            bloques.setdefault(clave, []).append(entrada)
+    _cache_bloques[filepath_miembros] = (firma, bloques)
+    return bloques
+
+
+def _comparar_bloques(
+    args: Tuple[List[List[Tuple[str, str, str]]], float],
+) -> List[Tuple[str, str, str, str, float]]:
+    """Compara todos los pares dentro de cada bloque recibido."""
+    bloques, umbral = args
+    pares = []
+    for bloque in bloques:
+        for a, b in combinations(bloque, 2):
+            if a[0] == b[0]:
+                continue
+            valor = similitud(a[1], b[1])
+            if valor >= umbral:
+                pares.append((a[0], b[0], a[2], b[2], valor))
+    return pares
+
+
+def detectar_duplicados(
+    filepath_miembros: str,
+    umbral: float = UMBRAL_SIMILITUD,
+    procesos: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    Detecta pares de miembros con nombres muy parecidos.
+
+    :param umbral: Similitud mínima (0 a 1) para reportar un par.
+    :param procesos: Número de procesos entre los que se reparten los bloques.
+    :return: Lista de pares {id_a, id_b, nombre_a, nombre_b, similitud},
+        ordenada de mayor a menor similitud.
+    """
+    bloques = [b for b in _indice_bloques(filepath_miembros).values() if len(b) > 1]
+    if procesos > 1 and len(bloques) > 1:
+        lotes = [(bloques[i::procesos], umbral) for i in range(procesos)]
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = [
+                par for pares in pool.map(_comparar_bloques, lotes) for par in pares
+            ]
+    else:
+        resultados = _comparar_bloques((bloques, umbral))
+
+    # Un mismo par puede aparecer en varios bloques.
+    unicos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for id_a, id_b, nombre_a, nombre_b, valor in resultados:
+        if id_b < id_a:
+            id_a, id_b, nombre_a, nombre_b = id_b, id_a, nombre_b, nombre_a
+        unicos[(id_a, id_b)] = {
+            "id_a": id_a,
+            "id_b": id_b,
+            "nombre_a": nombre_a,
+            "nombre_b": nombre_b,
+            "similitud": round(valor, 3),
+        }
+    return sorted(unicos.values(), key=lambda p: (-p["similitud"], p["id_a"]))
+
+
+def buscar_similares(
+    filepath_miembros: str, nombre: str, umbral: float = UMBRAL_SIMILITUD
+) -> List[Dict[str, Any]]:
+    """
+    Busca miembros existentes con un nombre parecido a `nombre`.
+
+    Solo se compara contra los miembros de los bloques del nombre dado.
+    """
+    normalizado = normalizar(nombre)
+    bloques = _indice_bloques(filepath_miembros)
+    candidatos = {}
+    for clave in claves_bloqueo(nombre):
+        for id_miembro, norm, original in bloques.get(clave, []):
+            candidatos[id_miembro] = (norm, original)
+
+    similares = []
+    for id_miembro, (norm, original) in candidatos.items():
+        valor = similitud(normalizado, norm)
+        if valor >= umbral:
+            similares.append(
+                {"id_miembro": id_miembro, "nombre": original, "similitud": valor}
+            )
+    return sorted(similares, key=lambda s: -s["similitud"])
+
+
+def fusionar_miembros(
+    filepath_miembros: str,
+    filepath_inscripciones: str,
+    id_conservar: str,
+    id_duplicado: str,
+) -> bool:
+    """
+    Fusiona un miembro duplicado en el que se conserva.
+
+    Las inscripciones del duplicado pasan al miembro conservado (si ya estaba
+    inscrito en esa clase, se descartan) y el duplicado se elimina. Cada
+    archivo se reescribe una sola vez.
+
+    :return: False si alguno de los dos miembros no existe o son el mismo.
+    """
+    miembros = datos.cargar_datos(filepath_miembros)
+    ids = {m.get("id_miembro") for m in miembros}
+    if id_conservar == id_duplicado or not {id_conservar, id_duplicado} <= ids:
+        return False
+
+    if particiones.es_particionado(filepath_inscripciones):
+        # Solo se tocan las particiones del duplicado y sus dos entradas del índice.
+        indice = particiones.cargar_indice_miembros(filepath_inscripciones)
+        clases_duplicado = indice.pop(id_duplicado, [])
+        for id_clase in clases_duplicado:
+            filas = particiones.cargar_particion(filepath_inscripciones, id_clase)
+            particiones.guardar_particion(
+                filepath_inscripciones,
+                id_clase,
+                _reasignar(filas, id_conservar, id_duplicado),
+            )
+        if clases_duplicado:
+            clases = indice.setdefault(id_conservar, [])
+            clases.extend(c for c in clases_duplicado if c not in clases)
+            particiones.guardar_indice_miembros(filepath_inscripciones, indice)
+    elif os.path.exists(filepath_inscripciones):
+        inscripciones = datos.cargar_datos(filepath_inscripciones)
+        datos.guardar_datos(
+            filepath_inscripciones,
+            _reasignar(inscripciones, id_conservar, id_duplicado),
+        )
+
+    datos.guardar_datos(
+        filepath_miembros, [m for m in miembros if m.get("id_miembro") != id_duplicado]
+    )
+    return True
+
+
+def _reasignar(
+    inscripciones: List[Dict[str, Any]], id_conservar: str, id_duplicado: str
+) -> List[Dict[str, Any]]:
+    clases_conservado = {
+        i.get("id_clase") for i in inscripciones if i.get("id_miembro") == id_conservar
+    }
+    resultado = []
+    for insc in inscripciones:
+        if insc.get("id_miembro") == id_duplicado:
+            if insc.get("id_clase") in clases_conservado:
+                continue
+            insc = {**insc, "id_miembro": id_conservar}
+            clases_conservado.add(insc.get("id_clase"))
+        resultado.append(insc)
+    return resultado
+
+
+def mostrar_duplicados(pares: List[Dict[str, Any]]) -> None:
+    """Muestra los pares de posibles duplicados en una tabla."""
+    if not pares:
+        console.print("[green]No se encontraron posibles duplicados.[/green]")
+        return
+    tabla = Table(title="POSIBLES MIEMBROS DUPLICADOS", style="cyan")
+    tabla.add_column("ID A", justify="center", style="yellow")
+    tabla.add_column("Nombre A")
+    tabla.add_column("ID B", justify="center", style="yellow")
+    tabla.add_column("Nombre B")
+    tabla.add_column("Similitud", justify="center", style="magenta")
+    for p in pares:
+        tabla.add_row(
+            p["id_a"], p["nombre_a"], p["id_b"], p["nombre_b"], f"{p['similitud']:.0%}"
+        )
+    console.print(tabla)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Detecta y fusiona miembros duplicados."
+    )
+    parser.add_argument("--info", default=crud.INFO_DIR, help="Directorio de datos")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_SIMILITUD)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--fusionar",
+        nargs=2,
+        metavar=("ID_CONSERVAR", "ID_DUPLICADO"),
+        help="Fusiona el duplicado en el miembro a conservar",
+    )
+    args = parser.parse_args()
+
+    filepath_miembros = os.path.join(args.info, "miembros.csv")
+    if args.fusionar:
+        id_conservar, id_duplicado = args.fusionar
+        if fusionar_miembros(
+            filepath_miembros,
+            particiones.ruta_inscripciones(args.info),
+            id_conservar,
+            id_duplicado,
+        ):
+            console.print(
+                f"[green]Miembro {id_duplicado} fusionado en {id_conservar}.[/green]"
+            )
+        else:
+            console.print("[red]No se pudo fusionar: revise los IDs.[/red]")
+        return
+
+    mostrar_duplicados(
+        detectar_duplicados(filepath_miembros, args.umbral, args.procesos)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Exportación.
+
+Exporta la vista "miembro × clase" (nombre y suscripción del miembro, nombre
+de la clase e instructor) a CSV o JSONL, opcionalmente comprimido con gzip.
+
+Miembros y clases se cargan en diccionarios por ID (hash join) y las
+inscripciones se recorren en streaming, escribiendo cada fila a medida que se
+produce. La memoria usada depende del tamaño de miembros y clases, no del
+número de inscripciones.
+
+Uso:
+
+    python exportar.py inscritos.csv.gz [--info info]
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+from typing import IO, Any, Dict, Iterator
+
+from rich.console import Console
+
+import crud
+import datos
+import particiones
+
+console = Console()
+
+CAMPOS_EXPORTACION = [
+    "id_miembro",
+    "nombre",
+    "tipo_suscripcion",
+    "id_clase",
+    "nombre_clase",
+    "instructor",
+]
+
+FORMATOS = ("csv", "jsonl")
+
+
+def _abrir_destino(destino: str) -> IO[str]:
+    if destino.endswith(".gz"):
+        return gzip.open(destino, mode="wt", newline="", encoding="utf-8")
+    return open(destino, mode="w", newline="", encoding="utf-8")
+
+
+def _formato_de(destino: str) -> str:
+    base = destino[: -len(".gz")] if destino.endswith(".gz") else destino
+    formato = os.path.splitext(base)[1].lstrip(".").lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportación no soportado: '{destino}'")
+    return formato
+
+
+def iterar_vista_inscripciones(
+    filepath_miembros: str, filepath_clases: str, filepath_inscripciones: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Genera las filas de la vista "miembro × clase" una a una.
+
+    Las inscripciones cuyo miembro o clase no existe se omiten.
+    """
+    miembros = {
+        m["id_miembro"]: m
+        for m in datos.cargar_datos(filepath_miembros)
+        if m.get("id_miembro")
+    }
+    clases = {
+        c["id_clase"]: c
+        for c in datos.cargar_datos(filepath_clases)
+        if c.get("id_clase")
+    }
+
+    for insc in particiones.iterar_inscripciones(filepath_inscripciones):
+        miembro = miembros.get(insc.get("id_miembro"))
+        clase = clases.get(insc.get("id_clase"))
+        if miembro is None or clase is None:
+            continue
+        yield {
+            "id_miembro": miembro["id_miembro"],
+            "nombre": miembro.get("nombre", ""),
+            "tipo_suscripcion": miembro.get("tipo_suscripcion", ""),
+            "id_clase": clase["id_clase"],
+            "nombre_clase": clase.get("nombre_clase", ""),
+            "instructor": clase.get("instructor", ""),
+        }
+
+
+def exportar_inscripciones(
+    filepath_miembros: str,
+    filepath_clases: str,
+    filepath_inscripciones: str,
+    destino: str,
+) -> int:
+    """
+    Exporta la vista "miembro × clase" al archivo destino.
+
+    El formato se deduce de la extensión: `.csv` o `.jsonl`, con `.gz`
+    opcional para comprimir (p. ej. `inscritos.jsonl.gz`).
+
+    :return: Número de filas exportadas.
+    :raises ValueError: Si la extensión del destino no es soportada.
+    """
+    formato = _formato_de(destino)
+    filas = iterar_vista_inscripciones(
+        filepath_miembros, filepath_clases, filepath_inscripciones
+    )
+
+    total = 0
+    with _abrir_destino(destino) as salida:
+        if formato == "csv":
+            writer = csv.DictWriter(salida, fieldnames=CAMPOS_EXPORTACION)
+            writer.writeheader()
+            for fila in filas:
+                writer.writerow(fila)
+                total += 1
+        else:
+            for fila in filas:
+                salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+                total += 1
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Exporta la vista miembro × clase a CSV o JSONL (.gz opcional)."
+    )
+    parser.add_argument("destino", help="Archivo destino (.csv, .jsonl, .gz)")
+    parser.add_argument("--info", default=crud.INFO_DIR, help="Directorio de datos")
+    args = parser.parse_args()
+
+    total = exportar_inscripciones(
+        os.path.join(args.info, "miembros.csv"),
+        os.path.join(args.info, "clases.csv"),
+        particiones.ruta_inscripciones(args.info),
+        args.destino,
+    )
+    console.print(f"[green]{total} filas exportadas a {args.destino}.[/green]")
+
+
+if __name__ == "__main__":
+    main()
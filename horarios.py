@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Horarios.
+
+Cada clase puede tener un horario semanal (día, hora de inicio, hora de fin y
+sala). Los horarios se representan como intervalos [inicio, fin) en minutos
+desde el lunes a las 00:00.
+
+Para detectar choques sin recorrer todas las inscripciones se mantienen
+índices de intervalos ordenados por inicio (uno por miembro y uno por sala).
+Una consulta hace una búsqueda binaria y solo revisa los intervalos que
+empiezan dentro de la duración máxima del índice, es decir O(log n + k).
+
+El índice por sala se reconstruye cuando cambia `clases.csv`. El índice por
+miembro se actualiza en memoria tras cada inscripción, baja o eliminación
+hecha desde `crud`, siempre que estuviera al día antes de esa escritura; ante
+cualquier otro cambio de los archivos se reconstruye.
+"""
+
+import bisect
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import datos
+import particiones
+
+DIAS_SEMANA = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+MINUTOS_DIA = 24 * 60
+
+Intervalo = Tuple[int, int]
+
+_cache_salas: Dict[str, Dict[str, Any]] = {}
+_cache_miembros: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+def _minutos(hora: str) -> int:
+    momento = datetime.strptime(hora.strip(), "%H:%M")
+    return momento.hour * 60 + momento.minute
+
+
+def validar_horario(horario: Dict[str, str]) -> Optional[str]:
+    """
+    Valida un horario {dia_semana, hora_inicio, hora_fin, sala}.
+
+    :return: Mensaje de error, o None si el horario es válido.
+    """
+    if horario.get("dia_semana") not in DIAS_SEMANA:
+        return f"Día de la semana inválido: {horario.get('dia_semana')}"
+    try:
+        inicio = _minutos(horario.get("hora_inicio", ""))
+        fin = _minutos(horario.get("hora_fin", ""))
+    except ValueError:
+        return "Las horas deben tener el formato HH:MM."
+    if fin <= inicio:
+        return "La hora de fin debe ser posterior a la de inicio."
+    if not (horario.get("sala") or "").strip():
+        return "La sala es obligatoria."
+    return None
+
+
+def intervalo_de(horario: Dict[str, Any]) -> Optional[Intervalo]:
+    """
+    Convierte el horario de una clase en un intervalo semanal en minutos.
+
+    :return: (inicio, fin), o None si la clase no tiene un horario válido.
+    """
+    if validar_horario(horario):
+        return None
+    base = DIAS_SEMANA.index(horario["dia_semana"]) * MINUTOS_DIA
+    return (
+        base + _minutos(horario["hora_inicio"]),
+        base + _minutos(horario["hora_fin"]),
+    )
+
+
+def nuevo_indice() -> Dict[str, Any]:
+    """Crea un índice de intervalos vacío."""
+    return {"inicios": [], "intervalos": [], "duracion_max": 0}
+
+
+def insertar(indice: Dict[str, Any], intervalo: Intervalo, id_clase: str) -> None:
+    """Inserta un intervalo manteniendo el índice ordenado por inicio."""
+    inicio, fin = intervalo
+    pos = bisect.bisect_right(indice["inicios"], inicio)
+    indice["inicios"].insert(pos, inicio)
+    indice["intervalos"].insert(pos, (inicio, fin, id_clase))
+    indice["duracion_max"] = max(indice["duracion_max"], fin - inicio)
+
+
+def quitar(indice: Dict[str, Any], id_clase: str) -> None:
+    """Quita del índice los intervalos de una clase."""
+    conservar = [i for i, iv in enumerate(indice["intervalos"]) if iv[2] != id_clase]
+    indice["inicios"] = [indice["inicios"][i] for i in conservar]
+    indice["intervalos"] = [indice["intervalos"][i] for i in conservar]
+
+
+def buscar_choque(
+    indice: Dict[str, Any], intervalo: Intervalo, ignorar: str = ""
+) -> Optional[str]:
+    """
+    Busca un intervalo del índice que se solape con `intervalo`.
+
+    :param ignorar: id_clase que no cuenta como choque (la propia clase).
+    :return: id_clase del primer choque encontrado, o None.
+    """
+    inicio, fin = intervalo
+    # Solo pueden solaparse los que empiezan antes de `fin` y no antes de
+    # `inicio - duracion_max`.
+    desde = bisect.bisect_right(indice["inicios"], inicio - indice["duracion_max"])
+    hasta = bisect.bisect_left(indice["inicios"], fin)
+    for otro_inicio, otro_fin, id_clase in indice["intervalos"][desde:hasta]:
+        if id_clase != ignorar and otro_inicio < fin and inicio < otro_fin:
+            return id_clase
+    return None
+
+
+def _intervalos_por_clase(filepath_clases: str) -> Dict[str, Intervalo]:
+    intervalos = {}
+    for clase in datos.cargar_datos(filepath_clases):
+        intervalo = intervalo_de(clase)
+        if intervalo:
+            intervalos[clase.get("id_clase", "")] = intervalo
+    return intervalos
+
+
+def indice_salas(filepath_clases: str) -> Dict[str, Dict[str, Any]]:
+    """Retorna {sala: índice} de las clases con horario."""
+    firma = datos.firma_archivo(filepath_clases)
+    en_cache = _cache_salas.get(filepath_clases)
+    if en_cache and en_cache["firma"] == firma:
+        return en_cache["salas"]
+
+    salas: Dict[str, Dict[str, Any]] = {}
+    for clase in datos.cargar_datos(filepath_clases):
+        intervalo = intervalo_de(clase)
+        if intervalo:
+            indice = salas.setdefault(clase["sala"].strip(), nuevo_indice())
+            insertar(indice, intervalo, clase["id_clase"])
+    _cache_salas[filepath_clases] = {"firma": firma, "salas": salas}
+    return salas
+
+
+def choque_sala(filepath_clases: str, horario: Dict[str, str]) -> Optional[str]:
+    """Retorna el id_clase que ya ocupa la sala en ese horario, o None."""
+    intervalo = intervalo_de(horario)
+    indice = indice_salas(filepath_clases).get(horario.get("sala", "").strip())
+    if not intervalo or not indice:
+        return None
+    return buscar_choque(indice, intervalo)
+
+
+def _firmas(filepath_inscripciones: str, filepath_clases: str) -> Tuple:
+    return (
+        datos.firma_archivo(filepath_inscripciones),
+        datos.firma_archivo(filepath_clases),
+    )
+
+
+def _indices_miembros(
+    filepath_inscripciones: str, filepath_clases: str
+) -> Dict[str, Dict[str, Any]]:
+    clave = (filepath_inscripciones, filepath_clases)
+    firmas = _firmas(filepath_inscripciones, filepath_clases)
+    en_cache = _cache_miembros.get(clave)
+    if en_cache and en_cache["firmas"] == firmas:
+        return en_cache["miembros"]
+
+    intervalos = _intervalos_por_clase(filepath_clases)
+    miembros: Dict[str, Dict[str, Any]] = {}
+    for insc in particiones.iterar_inscripciones(filepath_inscripciones):
+        intervalo = intervalos.get(insc.get("id_clase"))
+        if intervalo:
+            indice = miembros.setdefault(insc.get("id_miembro"), nuevo_indice())
+            insertar(indice, intervalo, insc["id_clase"])
+    _cache_miembros[clave] = {"firmas": firmas, "miembros": miembros}
+    return miembros
+
+
+def choque_miembro(
+    filepath_inscripciones: str,
+    filepath_clases: str,
+    id_miembro: str,
+    clase: Dict[str, Any],
+) -> Optional[str]:
+    """Retorna el id_clase del miembro que choca con el horario de `clase`."""
+    intervalo = intervalo_de(clase)
+    if not intervalo:
+        return None
+    indice = _indices_miembros(filepath_inscripciones, filepath_clases).get(id_miembro)
+    if not indice:
+        return None
+    return buscar_choque(indice, intervalo, ignorar=clase.get("id_clase", ""))
+
+
+def _entradas_al_dia(
+    filepath_inscripciones: str, firma_previa: Tuple
+) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+    """
+    Entradas en caché para `filepath_inscripciones` que estaban al día justo
+    antes de una escritura (firma `firma_previa`). Las demás se descartan,
+    porque parchearlas las marcaría como vigentes sin serlo.
+    """
+    vigentes = []
+    for clave, en_cache in list(_cache_miembros.items()):
+        if clave[0] != filepath_inscripciones:
+            continue
+        if en_cache["firmas"] == (firma_previa, datos.firma_archivo(clave[1])):
+            vigentes.append((clave, en_cache))
+        else:
+            del _cache_miembros[clave]
+    return vigentes
+
+
+def registrar_inscripcion(
+    filepath_inscripciones: str,
+    filepath_clases: str,
+    id_miembro: str,
+    clase: Dict[str, Any],
+    firma_previa: Tuple,
+) -> None:
+    """
+    Actualiza el índice del miembro tras guardar una inscripción, evitando
+    reconstruir todos los índices en la siguiente consulta.
+
+    :param firma_previa: `datos.firma_archivo(filepath_inscripciones)` tomada
+        antes de escribir.
+    """
+    for clave, en_cache in _entradas_al_dia(filepath_inscripciones, firma_previa):
+        if clave[1] != filepath_clases:
+            del _cache_miembros[clave]
+            continue
+        intervalo = intervalo_de(clase)
+        if intervalo:
+            indice = en_cache["miembros"].setdefault(id_miembro, nuevo_indice())
+            insertar(indice, intervalo, clase["id_clase"])
+        en_cache["firmas"] = _firmas(*clave)
+
+
+def registrar_baja(
+    filepath_inscripciones: str, id_miembro: str, id_clase: str, firma_previa: Tuple
+) -> None:
+    """Actualiza los índices tras dar de baja a un miembro de una clase."""
+    for clave, en_cache in _entradas_al_dia(filepath_inscripciones, firma_previa):
+        indice = en_cache["miembros"].get(id_miembro)
+        if indice:
+            quitar(indice, id_clase)
+        en_cache["firmas"] = _firmas(*clave)
+
+
+def registrar_eliminacion(
+    filepath_inscripciones: str, id_miembro: str, firma_previa: Tuple
+) -> None:
+    """Actualiza los índices tras eliminar todas las inscripciones de un miembro."""
+    for clave, en_cache in _entradas_al_dia(filepath_inscripciones, firma_previa):
+        en_cache["miembros"].pop(id_miembro, None)
+        en_cache["firmas"] = _firmas(*clave)
+
+
+def invalidar_cache() -> None:
+    """Descarta los índices en memoria."""
+    _cache_salas.clear()
+    _cache_miembros.clear()
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Integridad Referencial.
+
+Revisa en una sola pasada los archivos de datos y reporta:
+- Filas malformadas en miembros, clases o inscripciones.
+- Inscripciones huérfanas (miembro o clase inexistente).
+- Inscripciones duplicadas (mismo miembro y clase).
+- Clases con más inscritos que su `cupo_maximo`.
+
+Las inscripciones se cruzan contra conjuntos de IDs válidos. En el formato
+particionado cada partición se lee y revisa en un proceso del pool, de modo
+que el proceso principal no carga ni envía las inscripciones; el archivo
+monolítico se revisa en el proceso principal.
+
+Los miembros y clases malformados solo se reportan: mientras tengan un ID
+siguen contando como existentes. `reparar=True` solo toca las inscripciones
+(huérfanas, duplicadas, sobre el cupo o malformadas), que se reescriben una
+sola vez.
+
+Uso:
+
+    python integridad.py [--fix] [--procesos N] [--json]
+"""
+
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+import crud
+import datos
+import particiones
+
+console = Console()
+
+MALFORMADA = "fila_malformada"
+HUERFANA_MIEMBRO = "inscripcion_sin_miembro"
+HUERFANA_CLASE = "inscripcion_sin_clase"
+DUPLICADA = "inscripcion_duplicada"
+SOBRE_CUPO = "clase_sobre_cupo"
+
+_ids_miembros: FrozenSet[str] = frozenset()
+_ids_clases: FrozenSet[str] = frozenset()
+
+
+def _hallazgo(tipo: str, archivo: str, fila: Optional[int], detalle: str) -> Dict:
+    return {"tipo": tipo, "archivo": archivo, "fila": fila, "detalle": detalle}
+
+
+def _tiene_id(fila: Any, clave: str) -> bool:
+    return isinstance(fila, dict) and bool((fila.get(clave) or "").strip())
+
+
+def _miembro_valido(miembro: Any) -> bool:
+    return (
+        isinstance(miembro, dict)
+        and bool((miembro.get("id_miembro") or "").strip())
+        and bool((miembro.get("nombre") or "").strip())
+        and miembro.get("tipo_suscripcion") in crud.VALID_TIPOS_SUSCRIPCION
+    )
+
+
+def _clase_valida(clase: Any) -> bool:
+    if not isinstance(clase, dict) or not (clase.get("id_clase") or "").strip():
+        return False
+    try:
+        return int(clase.get("cupo_maximo")) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def _inscripcion_valida(insc: Any) -> bool:
+    return (
+        isinstance(insc, dict)
+        and isinstance(insc.get("id_miembro"), str)
+        and isinstance(insc.get("id_clase"), str)
+        and bool(insc["id_miembro"])
+        and bool(insc["id_clase"])
+    )
+
+
+def _inicializar_worker(ids_miembros: FrozenSet[str], ids_clases: FrozenSet[str]):
+    global _ids_miembros, _ids_clases
+    _ids_miembros = ids_miembros
+    _ids_clases = ids_clases
+
+
+def _revisar_fuente(
+    fuente: Tuple[str, str, Optional[str]],
+) -> Tuple[List[Dict], Counter]:
+    """
+    Lee una fuente de inscripciones (el archivo monolítico o una partición) y
+    la revisa contra los IDs válidos.
+
+    Retorna los hallazgos por fila y el conteo de pares (miembro, clase)
+    válidos, que se combinan después para detectar duplicados y sobrecupos.
+    """
+    archivo, ruta, id_clase = fuente
+    if id_clase is None:
+        filas = particiones.cargar_inscripciones(ruta)
+    else:
+        filas = particiones.cargar_particion(ruta, id_clase)
+    hallazgos = []
+    pares: Counter = Counter()
+    for n, insc in enumerate(filas):
+        if not _inscripcion_valida(insc):
+            hallazgos.append(_hallazgo(MALFORMADA, archivo, n, repr(insc)))
+            continue
+        id_miembro, id_clase = insc["id_miembro"], insc["id_clase"]
+        if id_miembro not in _ids_miembros:
+            hallazgos.append(_hallazgo(HUERFANA_MIEMBRO, archivo, n, id_miembro))
+        elif id_clase not in _ids_clases:
+            hallazgos.append(_hallazgo(HUERFANA_CLASE, archivo, n, id_clase))
+        else:
+            pares[(id_miembro, id_clase)] += 1
+    return hallazgos, pares
+
+
+def _guardar_inscripciones(ruta: str, inscripciones: List[Dict[str, Any]]) -> None:
+    if not particiones.es_particionado(ruta):
+        datos.guardar_datos(ruta, inscripciones)
+        return
+    por_clase: Dict[str, List[Dict[str, Any]]] = {
+        id_clase: [] for id_clase in particiones.listar_ids_clases(ruta)
+    }
+    for insc in inscripciones:
+        por_clase.setdefault(insc["id_clase"], []).append(insc)
+    for id_clase, filas in por_clase.items():
+        particiones.guardar_particion(ruta, id_clase, filas)
+    particiones.reconstruir_indice(ruta)
+
+
+def _fuentes(filepath_inscripciones: str) -> List[Tuple[str, str, Optional[str]]]:
+    """Fuentes a revisar: una por partición, o el archivo monolítico."""
+    archivo = os.path.basename(os.path.normpath(filepath_inscripciones))
+    if not particiones.es_particionado(filepath_inscripciones):
+        return [(archivo, filepath_inscripciones, None)]
+    fuentes = []
+    for id_clase in particiones.listar_ids_clases(filepath_inscripciones):
+        ruta = particiones.ruta_particion(filepath_inscripciones, id_clase)
+        nombre = os.path.join(archivo, os.path.basename(ruta))
+        fuentes.append((nombre, filepath_inscripciones, id_clase))
+    return fuentes
+
+
+def _revisar_inscripciones(
+    fuentes: List[Tuple[str, str, Optional[str]]],
+    ids_miembros: FrozenSet[str],
+    ids_clases: FrozenSet[str],
+    procesos: int,
+) -> Tuple[List[Dict[str, Any]], Counter]:
+    if procesos > 1 and len(fuentes) > 1:
+        with ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicializar_worker,
+            initargs=(ids_miembros, ids_clases),
+        ) as pool:
+            resultados = list(pool.map(_revisar_fuente, fuentes))
+    else:
+        _inicializar_worker(ids_miembros, ids_clases)
+        resultados = [_revisar_fuente(f) for f in fuentes]
+
+    hallazgos: List[Dict[str, Any]] = []
+    pares: Counter = Counter()
+    for hallazgos_bloque, pares_bloque in resultados:
+        hallazgos.extend(hallazgos_bloque)
+        pares.update(pares_bloque)
+    return hallazgos, pares
+
+
+def _inscripciones_limpias(
+    inscripciones: List[Any],
+    ids_miembros: FrozenSet[str],
+    ids_clases: FrozenSet[str],
+    cupos: Dict[str, int],
+) -> List[Dict[str, str]]:
+    """
+    Conserva la primera aparición de cada par válido, sin exceder el cupo (si
+    la clase tiene un cupo válido).
+    """
+    vistos = set()
+    ocupacion: Counter = Counter()
+    limpias = []
+    for insc in inscripciones:
+        if not _inscripcion_valida(insc):
+            continue
+        par = (insc["id_miembro"], insc["id_clase"])
+        if (
+            par[0] not in ids_miembros
+            or par[1] not in ids_clases
+            or par in vistos
+            or (par[1] in cupos and ocupacion[par[1]] >= cupos[par[1]])
+        ):
+            continue
+        vistos.add(par)
+        ocupacion[par[1]] += 1
+        limpias.append({"id_miembro": par[0], "id_clase": par[1]})
+    return limpias
+
+
+def verificar_integridad(
+    filepath_miembros: str,
+    filepath_clases: str,
+    filepath_inscripciones: str,
+    *,
+    procesos: int = 1,
+    reparar: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Verifica la integridad referencial de los archivos de datos.
+
+    :param procesos: Número de procesos para revisar las inscripciones
+        particionadas (una partición por tarea).
+    :param reparar: Si es True, elimina las inscripciones con hallazgos y
+        reescribe una vez su archivo. Miembros y clases nunca se modifican.
+    :return: Lista de hallazgos con las claves tipo, archivo, fila y detalle.
+    """
+    arch_c = os.path.basename(filepath_clases)
+    arch_i = os.path.basename(os.path.normpath(filepath_inscripciones))
+
+    miembros = datos.cargar_datos(filepath_miembros)
+    clases = datos.cargar_datos(filepath_clases)
+    hallazgos = [
+        _hallazgo(MALFORMADA, os.path.basename(filepath_miembros), n, repr(m))
+        for n, m in enumerate(miembros)
+        if not _miembro_valido(m)
+    ] + [
+        _hallazgo(MALFORMADA, arch_c, n, repr(c))
+        for n, c in enumerate(clases)
+        if not _clase_valida(c)
+    ]
+    # Un miembro o clase malformado sigue existiendo si tiene ID: sus
+    # inscripciones no son huérfanas.
+    ids_miembros = frozenset(
+        m["id_miembro"] for m in miembros if _tiene_id(m, "id_miembro")
+    )
+    ids_clases = frozenset(c["id_clase"] for c in clases if _tiene_id(c, "id_clase"))
+    cupos = {c["id_clase"]: int(c["cupo_maximo"]) for c in clases if _clase_valida(c)}
+
+    hallazgos_insc, pares = _revisar_inscripciones(
+        _fuentes(filepath_inscripciones), ids_miembros, ids_clases, procesos
+    )
+    hallazgos.extend(hallazgos_insc)
+
+    inscritos: Counter = Counter()
+    for (id_miembro, id_clase), veces in pares.items():
+        inscritos[id_clase] += 1
+        if veces > 1:
+            detalle = f"{id_miembro}/{id_clase} x{veces}"
+            hallazgos.append(_hallazgo(DUPLICADA, arch_i, None, detalle))
+    for id_clase, total in inscritos.items():
+        if id_clase in cupos and total > cupos[id_clase]:
+            detalle = f"{id_clase}: {total}/{cupos[id_clase]}"
+            hallazgos.append(_hallazgo(SOBRE_CUPO, arch_c, None, detalle))
+
+    if reparar and hallazgos:
+        inscripciones = particiones.cargar_inscripciones(filepath_inscripciones)
+        limpias = _inscripciones_limpias(inscripciones, ids_miembros, ids_clases, cupos)
+        if len(limpias) < len(inscripciones):
+            _guardar_inscripciones(filepath_inscripciones, limpias)
+
+    return hallazgos
+
+
+def mostrar_hallazgos(hallazgos: List[Dict[str, Any]]) -> None:
+    """Muestra los hallazgos en una tabla."""
+    if not hallazgos:
+        console.print("[green]No se encontraron problemas de integridad.[/green]")
+        return
+
+    tabla = Table(title="PROBLEMAS DE INTEGRIDAD", style="cyan")
+    tabla.add_column("Tipo", style="yellow")
+    tabla.add_column("Archivo")
+    tabla.add_column("Fila", justify="center")
+    tabla.add_column("Detalle", style="red")
+    for h in hallazgos:
+        fila = "" if h["fila"] is None else str(h["fila"])
+        tabla.add_row(h["tipo"], h["archivo"], fila, h["detalle"])
+    console.print(tabla)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verifica la integridad de los datos.")
+    parser.add_argument("--info", default=crud.INFO_DIR, help="Directorio de datos")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--fix", action="store_true", help="Repara el archivo de inscripciones"
+    )
+    parser.add_argument("--json", action="store_true", help="Salida en JSON")
+    args = parser.parse_args()
+
+    hallazgos = verificar_integridad(
+        os.path.join(args.info, "miembros.csv"),
+        os.path.join(args.info, "clases.csv"),
+        particiones.ruta_inscripciones(args.info),
+        procesos=args.procesos,
+        reparar=args.fix,
+    )
+    if args.json:
+        console.print_json(data=hallazgos)
+    else:
+        mostrar_hallazgos(hallazgos)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,58 @@ Sistema de gestión de gimnasio
 --------------------------------
 Permite administrar miembros, clases e inscripciones.
 """
+# El reloj de arranque empieza antes de importar el resto de los módulos, para
+# que el informe de `--tiempos` incluya el costo de las importaciones.
+# ruff: noqa: E402
 
+import time
+
+INICIO_PROCESO = time.perf_counter()
+
+import argparse
 import os
-from typing import Optional
+from datetime import date, timedelta
+from typing import Dict, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
 
+import analitica
+import arranque
+import asistencia
 import crud
 import datos
+import duplicados
+import horarios
+import particiones
+import tablero
+import vencimientos
 
 console = Console()
 
-INFO_DIR = "info"
+INFO_DIR = crud.INFO_DIR
 MIEMBROS_FILE = os.path.join(INFO_DIR, "miembros.csv")
 CLASES_FILE = os.path.join(INFO_DIR, "clases.csv")
-INSCRIPCIONES_FILE = os.path.join(INFO_DIR, "inscripciones.json")
+# Si existe el directorio de particiones (ver particiones.py), se usa en lugar
+# del archivo monolítico.
+INSCRIPCIONES_FILE = particiones.ruta_inscripciones(INFO_DIR)
+ASISTENCIA_DIR = os.path.join(INFO_DIR, "asistencia")
+
+
+def configurar_rutas(info_dir: str) -> None:
+    """
+    Apunta todas las rutas de datos al directorio de una sede.
+
+    :param info_dir: Directorio con los archivos de datos de la sede.
+    """
+    global INFO_DIR, MIEMBROS_FILE, CLASES_FILE, INSCRIPCIONES_FILE, ASISTENCIA_DIR
+    INFO_DIR = info_dir
+    MIEMBROS_FILE = os.path.join(info_dir, "miembros.csv")
+    CLASES_FILE = os.path.join(info_dir, "clases.csv")
+    INSCRIPCIONES_FILE = particiones.ruta_inscripciones(info_dir)
+    ASISTENCIA_DIR = os.path.join(info_dir, "asistencia")
 
 
 def solicitar_tipo_suscripcion(permitir_vacio: bool = False) -> Optional[str]:
@@ -68,39 +102,60 @@ def mostrar_tabla(lista, titulo):
     if (
         (titulo == "LISTA DE MIEMBROS" or "MIEMBROS INSCRITOS" in titulo)
         and lista
-        and all(k in lista[0] for k in datos.CAMPOS_MIEMBROS)
+        and all(
+            k in lista[0]
+            for k in datos.CAMPOS_MIEMBROS
+            if k not in datos.CAMPOS_SUSCRIPCION
+        )
     ):
         tabla.add_column("ID", justify="center", style="yellow")
         tabla.add_column("Nombre", justify="left", style="white")
         tabla.add_column("Suscripción", justify="center", style="magenta")
+        tabla.add_column("Vence", justify="center")
 
         for item in lista:
             suscripcion = item.get("tipo_suscripcion", "")
             color = "green" if suscripcion == "Anual" else "blue"
+            vence = item.get("fecha_vencimiento") or ""
+            if vence and not vencimientos.esta_activo(item):
+                vence = f"[red]{vence} (inactivo)[/red]"
             tabla.add_row(
                 item.get("id_miembro", ""),
                 item.get("nombre", ""),
                 f"[{color}]{suscripcion}[/{color}]",
+                vence,
             )
 
     # Lógica específica para Clases
     elif (
         (titulo == "LISTA DE CLASES" or "CLASES DE MIEMBRO" in titulo)
         and lista
-        and all(k in lista[0] for k in datos.CAMPOS_CLASES)
+        and all(
+            k in lista[0] for k in datos.CAMPOS_CLASES if k not in datos.CAMPOS_HORARIO
+        )
     ):
         tabla.add_column("ID", justify="center", style="yellow")
         tabla.add_column("Clase", justify="left", style="white")
         tabla.add_column("Instructor", justify="left", style="blue")
         tabla.add_column("Cupo Máximo", justify="center", style="magenta")
+        tabla.add_column("Horario", justify="center", style="green")
+        tabla.add_column("Sala", justify="center")
 
         for item in lista:
             cupo_max = item.get("cupo_maximo", "0")
+            horario = ""
+            if item.get("dia_semana"):
+                horario = (
+                    f"{item['dia_semana']} "
+                    f"{item.get('hora_inicio', '')}-{item.get('hora_fin', '')}"
+                )
             tabla.add_row(
                 item.get("id_clase", ""),
                 item.get("nombre_clase", ""),
                 item.get("instructor", ""),
                 cupo_max,
+                horario,
+                item.get("sala", ""),
             )
 
     else:
@@ -116,11 +171,28 @@ def mostrar_tabla(lista, titulo):
 def registrar_miembro():
     """Opción 1: Registrar un nuevo miembro."""
     nombre = Prompt.ask("Nombre completo")
+
+    similares = duplicados.buscar_similares(MIEMBROS_FILE, nombre)
+    if similares:
+        console.print("[yellow]Ya existen miembros con un nombre parecido:[/yellow]")
+        for similar in similares:
+            console.print(f" - ID {similar['id_miembro']}: {similar['nombre']}")
+        confirmar = Prompt.ask(
+            "¿Registrar de todos modos? (S/N)",
+            choices=["S", "N", "s", "n"],
+            show_choices=False,
+        ).lower()
+        if confirmar != "s":
+            console.print("[cyan]Registro cancelado.[/cyan]")
+            pausar()
+            return
+
     tipo = solicitar_tipo_suscripcion()
     miembro = crud.crear_miembro(MIEMBROS_FILE, nombre, tipo)
     if miembro:
-        console.print(f"[green]Miembro creado con éxito (ID {miembro['id_miembro']})."
-                      f"[/green]")
+        console.print(
+            f"[green]Miembro creado con éxito (ID {miembro['id_miembro']}).[/green]"
+        )
     pausar()
 
 
@@ -149,11 +221,20 @@ def actualizar_miembro():
     console.print("\n[bold]--- TIPO DE SUSCRIPCIÓN ---[/bold]")
     nuevo_tipo = solicitar_tipo_suscripcion(permitir_vacio=True)
 
+    renovar = Prompt.ask(
+        "¿Renovar la suscripción desde hoy? (S/N)",
+        choices=["S", "N", "s", "n"],
+        default="N",
+        show_choices=False,
+    ).lower()
+
     datos_nuevos = {}
     if nuevo_nombre.strip():
         datos_nuevos["nombre"] = nuevo_nombre
     if nuevo_tipo:
         datos_nuevos["tipo_suscripcion"] = nuevo_tipo
+    if renovar == "s":
+        datos_nuevos["fecha_inicio"] = date.today().isoformat()
 
     if not datos_nuevos:
         console.print("[yellow]No se realizaron cambios.[/yellow]")
@@ -163,7 +244,9 @@ def actualizar_miembro():
     console.print("\n[bold cyan]Resumen de cambios propuestos:[/bold cyan]")
     for campo, valor in datos_nuevos.items():
         valor_actual = miembro.get(campo, "(sin valor previo)")
-        console.print(f" - {campo}: [yellow]{valor_actual}[/yellow] → [green]{valor}[/green]")
+        console.print(
+            f" - {campo}: [yellow]{valor_actual}[/yellow] → [green]{valor}[/green]"
+        )
 
     confirmar = Prompt.ask(
         "\n¿Desea aplicar estos cambios? (S/N)",
@@ -195,7 +278,9 @@ def eliminar_miembro():
         return
 
     nombre = miembro.get("nombre", "Desconocido")
-    console.print(f"\n[bold yellow]Miembro encontrado:[/bold yellow] {nombre} (ID: {id_miembro})")
+    console.print(
+        f"\n[bold yellow]Miembro encontrado:[/bold yellow] {nombre} (ID: {id_miembro})"
+    )
 
     confirmar = Prompt.ask(
         f"¿Está seguro que desea eliminar a [red]{nombre}[/red]? (S/N)",
@@ -216,6 +301,31 @@ def eliminar_miembro():
     pausar()
 
 
+def vencimientos_proximos():
+    """Opción 5: Ver vencimientos próximos y desactivar a los vencidos."""
+    dias = Prompt.ask("Días hacia adelante", default="7")
+    if not dias.isdigit():
+        console.print("[red]Ingrese un número de días válido.[/red]")
+        pausar()
+        return
+    vencimientos.mostrar_por_vencer(MIEMBROS_FILE, int(dias))
+
+    pendientes = vencimientos.vencidos(MIEMBROS_FILE)
+    if pendientes:
+        confirmar = Prompt.ask(
+            f"Hay {len(pendientes)} miembros vencidos aún activos. "
+            "¿Desactivarlos y darlos de baja de sus clases? (S/N)",
+            choices=["S", "N", "s", "n"],
+            show_choices=False,
+        ).lower()
+        if confirmar == "s":
+            resultado = vencimientos.barrer_vencidos(MIEMBROS_FILE, INSCRIPCIONES_FILE)
+            console.print(
+                f"[green]{resultado['desactivados']} miembros desactivados, "
+                f"{resultado['inscripciones']} inscripciones eliminadas.[/green]"
+            )
+    pausar()
+
 
 def menu_miembros():
     """Menú principal de gestión de miembros."""
@@ -224,6 +334,7 @@ def menu_miembros():
         "2": ver_todos_los_miembros,
         "3": actualizar_miembro,
         "4": eliminar_miembro,
+        "5": vencimientos_proximos,
     }
 
     while True:
@@ -233,14 +344,18 @@ def menu_miembros():
             "2. Ver todos los miembros\n"
             "3. Actualizar datos de miembro\n"
             "4. Eliminar miembro\n"
+            "5. Vencimientos de suscripciones\n"
             "\n"
             "0. Volver al menú principal"
         )
         panel_menu = Panel(menu_content, border_style="bold cyan", padding=(1, 2))
         console.print(panel_menu)
 
-        opcion = Prompt.ask("Seleccione una opción", choices=["0", "1", "2", "3", "4"],
-                            show_choices=False)
+        opcion = Prompt.ask(
+            "Seleccione una opción",
+            choices=["0", "1", "2", "3", "4", "5"],
+            show_choices=False,
+        )
 
         if opcion == "0":
             break
@@ -249,6 +364,33 @@ def menu_miembros():
             accion()
 
 
+def solicitar_horario() -> Optional[Dict[str, str]]:
+    """
+    Pregunta si la clase tiene horario y, en ese caso, lo solicita.
+
+    :return: Diccionario con dia_semana, hora_inicio, hora_fin y sala, o None.
+    """
+    agregar = Prompt.ask(
+        "¿Asignar horario y sala? (S/N)",
+        choices=["S", "N", "s", "n"],
+        show_choices=False,
+    ).lower()
+    if agregar != "s":
+        return None
+
+    console.print("\nSeleccione el día:", style="cyan")
+    dias = {str(n): dia for n, dia in enumerate(horarios.DIAS_SEMANA, start=1)}
+    for key, value in dias.items():
+        console.print(f"{key}. {value}")
+    dia = dias[Prompt.ask("Opción", choices=list(dias), show_choices=False)]
+
+    return {
+        "dia_semana": dia,
+        "hora_inicio": Prompt.ask("Hora de inicio (HH:MM)"),
+        "hora_fin": Prompt.ask("Hora de fin (HH:MM)"),
+        "sala": Prompt.ask("Sala"),
+    }
+
 
 def menu_clases():
     while True:
@@ -257,6 +399,7 @@ def menu_clases():
             "1. Registrar nueva clase\n"
             "2. Ver todas las clases\n"
             "3. Ver cupos disponibles\n"
+            "4. Tablero de cupos en vivo\n"
             "\n"
             "0. Volver al menú principal"
         )
@@ -264,7 +407,9 @@ def menu_clases():
         console.print(panel_menu)
 
         opcion = Prompt.ask(
-            "Seleccione una opción", choices=["0", "1", "2", "3"], show_choices=False
+            "Seleccione una opción",
+            choices=["0", "1", "2", "3", "4"],
+            show_choices=False,
         )
 
         if opcion == "0":
@@ -282,7 +427,8 @@ def menu_clases():
                 pausar()
                 continue
 
-            clase = crud.crear_clase(CLASES_FILE, nombre, instructor, cupo)
+            horario = solicitar_horario()
+            clase = crud.crear_clase(CLASES_FILE, nombre, instructor, cupo, horario)
             if clase:
                 console.print(
                     f"[green]Clase creada con éxito (ID {clase['id_clase']}).[/green]"
@@ -295,9 +441,12 @@ def menu_clases():
             pausar()
 
         elif opcion == "3":
-            crud.ver_cupos_disponibles()
+            crud.ver_cupos_disponibles(CLASES_FILE, INSCRIPCIONES_FILE)
             pausar()
 
+        elif opcion == "4":
+            tablero.ejecutar_tablero(CLASES_FILE, INSCRIPCIONES_FILE)
+
 
 def solicitar_id(tipo: str) -> str:
     """Solicita un ID no vacío."""
@@ -307,13 +456,15 @@ def solicitar_id(tipo: str) -> str:
             return id_valor
         console.print(f"[red]Error:[/red] El ID del {tipo} no puede estar vacío.")
 
+
 def inscribir_miembro():
     """Opción 1: Inscribir miembro en clase."""
     id_miembro = solicitar_id("miembro")
     miembro = crud.buscar_miembro_por_id(MIEMBROS_FILE, id_miembro)
     if not miembro:
-        console.print(f"[red]Error:[/red] No existe ningún miembro con ID"
-                      f" '{id_miembro}'.")
+        console.print(
+            f"[red]Error:[/red] No existe ningún miembro con ID '{id_miembro}'."
+        )
         pausar()
         return
 
@@ -325,7 +476,7 @@ def inscribir_miembro():
         return
 
     exito, mensaje = crud.inscribir_miembro_en_clase(
-        INSCRIPCIONES_FILE, CLASES_FILE, id_miembro, id_clase
+        INSCRIPCIONES_FILE, CLASES_FILE, id_miembro, id_clase, MIEMBROS_FILE
     )
     color = "green" if exito else "red"
     console.print(f"[{color}]{mensaje}[/{color}]")
@@ -368,6 +519,27 @@ def ver_clases_de_miembro():
     pausar()
 
 
+def registrar_asistencia():
+    """Opción 5: Registrar la asistencia (check-in) de un miembro a una clase."""
+    id_miembro = solicitar_id("miembro")
+    if not crud.buscar_miembro_por_id(MIEMBROS_FILE, id_miembro):
+        console.print(
+            f"[red]Error:[/red] No existe ningún miembro con ID '{id_miembro}'."
+        )
+        pausar()
+        return
+
+    id_clase = solicitar_id("clase")
+    if not crud.buscar_clase_por_id(CLASES_FILE, id_clase):
+        console.print(f"[red]Error:[/red] No existe ninguna clase con ID '{id_clase}'.")
+        pausar()
+        return
+
+    evento = asistencia.registrar_asistencia(ASISTENCIA_DIR, id_miembro, id_clase)
+    console.print(f"[green]Asistencia registrada ({evento['momento']}).[/green]")
+    pausar()
+
+
 def menu_inscripciones():
     """Menú principal de gestión de inscripciones."""
     opciones = {
@@ -375,6 +547,7 @@ def menu_inscripciones():
         "2": dar_baja_miembro,
         "3": ver_miembros_de_clase,
         "4": ver_clases_de_miembro,
+        "5": registrar_asistencia,
     }
 
     while True:
@@ -384,14 +557,141 @@ def menu_inscripciones():
             "2. Dar de baja miembro de clase\n"
             "3. Ver miembros inscritos en una clase\n"
             "4. Ver clases inscritas por miembro\n"
+            "5. Registrar asistencia\n"
             "\n"
             "0. Volver al menú principal"
         )
         panel_menu = Panel(menu_content, border_style="bold magenta", padding=(1, 2))
         console.print(panel_menu)
 
-        opcion = Prompt.ask("Seleccione una opción", choices=["0", "1", "2", "3", "4"],
-                            show_choices=False)
+        opcion = Prompt.ask(
+            "Seleccione una opción",
+            choices=["0", "1", "2", "3", "4", "5"],
+            show_choices=False,
+        )
+
+        if opcion == "0":
+            break
+        accion = opciones.get(opcion)
+        if accion:
+            accion()
+
+
+def _vistas():
+    return analitica.obtener_vistas(MIEMBROS_FILE, CLASES_FILE, INSCRIPCIONES_FILE)
+
+
+def reporte_ocupacion_instructor():
+    """Opción 1: Ocupación por instructor."""
+    filas = [
+        {
+            "Instructor": instructor,
+            "Clases": v["clases"],
+            "Cupo total": v["cupo_total"],
+            "Inscritos": v["inscritos"],
+            "Ocupación": f"{v['ocupacion']:.0%}",
+        }
+        for instructor, v in sorted(_vistas()["ocupacion_por_instructor"].items())
+    ]
+    mostrar_tabla(filas, "OCUPACIÓN POR INSTRUCTOR")
+    pausar()
+
+
+def reporte_suscripciones():
+    """Opción 2: Mezcla de suscripciones."""
+    mezcla = _vistas()["mezcla_suscripciones"]
+    total = sum(mezcla.values())
+    filas = [
+        {"Suscripción": tipo, "Miembros": n, "Porcentaje": f"{n / total:.0%}"}
+        for tipo, n in sorted(mezcla.items())
+    ]
+    mostrar_tabla(filas, "MEZCLA DE SUSCRIPCIONES")
+    pausar()
+
+
+def reporte_clases_por_miembro():
+    """Opción 3: Distribución de clases por miembro."""
+    filas = [
+        {"Clases inscritas": n_clases, "Miembros": n_miembros}
+        for n_clases, n_miembros in _vistas()["distribucion_clases_por_miembro"].items()
+    ]
+    mostrar_tabla(filas, "CLASES POR MIEMBRO")
+    pausar()
+
+
+def reporte_llenado():
+    """Opción 4: Distribución de la tasa de llenado de las clases."""
+    distribucion = _vistas()["distribucion_llenado"]
+    filas = [
+        {"Llenado": tramo, "Clases": n} for tramo, n in distribucion["tramos"].items()
+    ]
+    mostrar_tabla(filas, "DISTRIBUCIÓN DE LLENADO")
+    console.print(
+        f"Media: {distribucion['media']:.0%}  "
+        f"Mediana: {distribucion['mediana']:.0%}  "
+        f"Mín: {distribucion['minimo']:.0%}  "
+        f"Máx: {distribucion['maximo']:.0%}"
+    )
+    pausar()
+
+
+def reporte_asistencia():
+    """Opción 5: Asistencia por clase en los últimos 7 días."""
+    hasta = date.today()
+    desde = hasta - timedelta(days=6)
+    clases = crud.leer_todas_las_clases(CLASES_FILE)
+    resumen = asistencia.resumen_por_clase(
+        ASISTENCIA_DIR,
+        INSCRIPCIONES_FILE,
+        [c["id_clase"] for c in clases],
+        desde,
+        hasta,
+    )
+    filas = []
+    for clase in clases:
+        fila = resumen[clase["id_clase"]]
+        filas.append(
+            {
+                "ID": clase["id_clase"],
+                "Clase": clase["nombre_clase"],
+                "Sesiones": fila["sesiones"],
+                "Asistencias": fila["asistencias"],
+                "Tasa": f"{fila['tasa']:.0%}",
+            }
+        )
+    mostrar_tabla(filas, "ASISTENCIA ÚLTIMOS 7 DÍAS")
+    pausar()
+
+
+def menu_reportes():
+    """Menú de reportes de gestión."""
+    opciones = {
+        "1": reporte_ocupacion_instructor,
+        "2": reporte_suscripciones,
+        "3": reporte_clases_por_miembro,
+        "4": reporte_llenado,
+        "5": reporte_asistencia,
+    }
+
+    while True:
+        menu_content = (
+            "[bold cyan]*** REPORTES ***[/bold cyan]\n"
+            "1. Ocupación por instructor\n"
+            "2. Mezcla de suscripciones\n"
+            "3. Clases por miembro\n"
+            "4. Distribución de llenado\n"
+            "5. Asistencia últimos 7 días\n"
+            "\n"
+            "0. Volver al menú principal"
+        )
+        panel_menu = Panel(menu_content, border_style="bold green", padding=(1, 2))
+        console.print(panel_menu)
+
+        opcion = Prompt.ask(
+            "Seleccione una opción",
+            choices=["0", "1", "2", "3", "4", "5"],
+            show_choices=False,
+        )
 
         if opcion == "0":
             break
@@ -399,6 +699,7 @@ def menu_inscripciones():
         if accion:
             accion()
 
+
 def menu_principal():
     while True:
         menu_content = (
@@ -406,6 +707,7 @@ def menu_principal():
             "1. Gestión de Miembros\n"
             "2. Gestión de Clases\n"
             "3. Gestión de Inscripciones\n"
+            "4. Reportes\n"
             "\n"
             "0. Salir"
         )
@@ -413,7 +715,9 @@ def menu_principal():
         console.print(panel_menu)
 
         opcion = Prompt.ask(
-            "Seleccione una opción", choices=["0", "1", "2", "3"], show_choices=False
+            "Seleccione una opción",
+            choices=["0", "1", "2", "3", "4"],
+            show_choices=False,
         )
 
         if opcion == "0":
@@ -425,12 +729,30 @@ def menu_principal():
             menu_clases()
         elif opcion == "3":
             menu_inscripciones()
+        elif opcion == "4":
+            menu_reportes()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sistema de gestión de gimnasio")
+    parser.add_argument(
+        "--info", default=INFO_DIR, help="Directorio de datos de la sede"
+    )
+    parser.add_argument(
+        "--tiempos", action="store_true", help="Muestra los tiempos de arranque"
+    )
+    args = parser.parse_args()
+    configurar_rutas(args.info)
     os.makedirs(INFO_DIR, exist_ok=True)
 
-    # Llama a la nueva función en datos.py
-    datos.inicializar_archivos(MIEMBROS_FILE, CLASES_FILE, INSCRIPCIONES_FILE)
+    # Inicializa los archivos y los precarga en segundo plano (ver arranque.py).
+    informe = arranque.iniciar(
+        MIEMBROS_FILE, CLASES_FILE, INSCRIPCIONES_FILE, inicio=INICIO_PROCESO
+    )
+    arranque.marcar_menu(informe)
 
     menu_principal()
+
+    if args.tiempos:
+        arranque.esperar_precarga(informe)
+        arranque.mostrar_informe(informe)
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Inscripciones Particionadas.
+
+Alternativa al archivo monolítico `inscripciones.json`: las inscripciones se
+guardan en un directorio con un archivo por clase (`clase_<id>.json`), de modo
+que inscribir o dar de baja solo reescribe la partición de esa clase.
+
+Para las consultas centradas en el miembro (y la cascada de `eliminar_miembro`)
+se mantiene un índice secundario `_miembros.json` con el mapa
+id_miembro -> [id_clase, ...].
+
+Uso como herramienta de migración:
+
+    python particiones.py info/inscripciones.json info/inscripciones
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Set
+
+from rich.console import Console
+
+import datos
+
+console = Console()
+
+PREFIJO_PARTICION = "clase_"
+INDICE_MIEMBROS = "_miembros.json"
+
+
+def es_particionado(ruta: str) -> bool:
+    """
+    Indica si una ruta de inscripciones usa el formato particionado.
+
+    El formato monolítico es siempre un archivo `.json`; el particionado, un
+    directorio existente (lo crean `crear_almacen` o `migrar_a_particiones`).
+
+    :raises FileNotFoundError: Si la ruta no es un `.json` ni un directorio
+        existente (p. ej. una ruta mal escrita), en lugar de crear en silencio
+        un almacén particionado nuevo.
+    """
+    if ruta.endswith(".json"):
+        return False
+    if not os.path.isdir(ruta):
+        raise FileNotFoundError(
+            f"No existe el directorio de inscripciones particionadas: '{ruta}'"
+        )
+    return True
+
+
+def crear_almacen(directorio: str) -> None:
+    """Crea un directorio de inscripciones particionadas vacío."""
+    os.makedirs(directorio, exist_ok=True)
+    if not os.path.exists(os.path.join(directorio, INDICE_MIEMBROS)):
+        guardar_indice_miembros(directorio, {})
+
+
+def ruta_particion(directorio: str, id_clase: str) -> str:
+    """Retorna la ruta del archivo de partición de una clase."""
+    nombre_seguro = re.sub(r"[^\w-]", "_", str(id_clase))
+    return os.path.join(directorio, f"{PREFIJO_PARTICION}{nombre_seguro}.json")
+
+
+def cargar_particion(directorio: str, id_clase: str) -> List[Dict[str, Any]]:
+    """Carga las inscripciones de una clase. No crea la partición si no existe."""
+    ruta = ruta_particion(directorio, id_clase)
+    if not os.path.exists(ruta):
+        return []
+    return datos.cargar_datos(ruta)
+
+
+def guardar_particion(
+    directorio: str, id_clase: str, inscripciones: List[Dict[str, Any]]
+) -> None:
+    """Guarda las inscripciones de una clase; borra la partición si queda vacía."""
+    ruta = ruta_particion(directorio, id_clase)
+    if not inscripciones:
+        if os.path.exists(ruta):
+            os.remove(ruta)
+        return
+    datos.guardar_datos(ruta, inscripciones)
+
+
+def cargar_indice_miembros(directorio: str) -> Dict[str, List[str]]:
+    """Carga el índice secundario id_miembro -> lista de id_clase."""
+    ruta = os.path.join(directorio, INDICE_MIEMBROS)
+    try:
+        with open(ruta, mode="r", encoding="utf-8") as json_file:
+            indice = json.load(json_file)
+            return indice if isinstance(indice, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def guardar_indice_miembros(directorio: str, indice: Dict[str, List[str]]) -> None:
+    """Guarda el índice secundario de miembros."""
+    ruta = os.path.join(directorio, INDICE_MIEMBROS)
+    with datos.escritura_atomica(ruta) as json_file:
+        json.dump(indice, json_file, indent=4)
+
+
+def listar_ids_clases(directorio: str) -> List[str]:
+    """Lista los id_clase que tienen partición en el directorio."""
+    if not os.path.isdir(directorio):
+        return []
+    ids = []
+    for nombre in sorted(os.listdir(directorio)):
+        if nombre.startswith(PREFIJO_PARTICION) and nombre.endswith(".json"):
+            ids.append(nombre[len(PREFIJO_PARTICION) : -len(".json")])
+    return ids
+
+
+def cargar_todas(directorio: str) -> List[Dict[str, Any]]:
+    """Carga todas las inscripciones de todas las particiones."""
+    inscripciones = []
+    for id_clase in listar_ids_clases(directorio):
+        inscripciones.extend(cargar_particion(directorio, id_clase))
+    return inscripciones
+
+
+def cargar_inscripciones(ruta: str) -> List[Dict[str, Any]]:
+    """
+    Carga todas las inscripciones, ya sea de un archivo monolítico o de un
+    directorio de particiones. No crea el archivo si no existe.
+    """
+    if es_particionado(ruta):
+        return cargar_todas(ruta)
+    if not os.path.exists(ruta):
+        return []
+    return datos.cargar_datos(ruta)
+
+
+def iterar_archivo(ruta: str, tolerante: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre un archivo de inscripciones (monolítico o una partición).
+
+    :param tolerante: Si es True, un archivo corrupto o truncado no produce
+        error: el recorrido termina en el primer elemento ilegible.
+    :raises json.JSONDecodeError: Si el archivo es inválido y no es tolerante.
+    """
+    try:
+        yield from datos.iterar_json(ruta)
+    except json.JSONDecodeError:
+        if not tolerante:
+            raise
+
+
+def iterar_inscripciones(
+    ruta: str, tolerante: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre las inscripciones sin cargarlas todas en memoria.
+
+    En el formato particionado se lee una partición a la vez. Las pantallas
+    interactivas usan `tolerante=True` (ver `iterar_archivo`) para seguir
+    mostrando datos ante un archivo dañado; `exportar` usa el modo estricto.
+    """
+    if es_particionado(ruta):
+        for id_clase in listar_ids_clases(ruta):
+            yield from iterar_archivo(ruta_particion(ruta, id_clase), tolerante)
+    else:
+        yield from iterar_archivo(ruta, tolerante)
+
+
+def ruta_inscripciones(info_dir: str) -> str:
+    """
+    Retorna la ruta de inscripciones de un directorio de datos: el directorio
+    de particiones si existe, o el archivo monolítico en caso contrario.
+    """
+    directorio = os.path.join(info_dir, "inscripciones")
+    if os.path.isdir(directorio):
+        return directorio
+    return os.path.join(info_dir, "inscripciones.json")
+
+
+def agregar_inscripcion(directorio: str, id_miembro: str, id_clase: str) -> None:
+    """Agrega una inscripción a la partición de la clase y al índice."""
+    inscripciones = cargar_particion(directorio, id_clase)
+    inscripciones.append({"id_miembro": id_miembro, "id_clase": id_clase})
+    guardar_particion(directorio, id_clase, inscripciones)
+
+    indice = cargar_indice_miembros(directorio)
+    clases = indice.setdefault(id_miembro, [])
+    if id_clase not in clases:
+        clases.append(id_clase)
+    guardar_indice_miembros(directorio, indice)
+
+
+def quitar_inscripcion(directorio: str, id_miembro: str, id_clase: str) -> bool:
+    """Quita una inscripción. Retorna False si no existía."""
+    inscripciones = cargar_particion(directorio, id_clase)
+    restantes = [i for i in inscripciones if i.get("id_miembro") != id_miembro]
+    if len(restantes) == len(inscripciones):
+        return False
+    guardar_particion(directorio, id_clase, restantes)
+
+    indice = cargar_indice_miembros(directorio)
+    clases = [c for c in indice.get(id_miembro, []) if c != id_clase]
+    if clases:
+        indice[id_miembro] = clases
+    else:
+        indice.pop(id_miembro, None)
+    guardar_indice_miembros(directorio, indice)
+    return True
+
+
+def clases_de_miembro(directorio: str, id_miembro: str) -> List[str]:
+    """Retorna los id_clase en los que está inscrito un miembro (vía índice)."""
+    return list(cargar_indice_miembros(directorio).get(id_miembro, []))
+
+
+def eliminar_inscripciones_de_miembro(directorio: str, id_miembro: str) -> int:
+    """
+    Elimina todas las inscripciones de un miembro.
+
+    Solo reescribe las particiones listadas en el índice para ese miembro.
+
+    :return: Número de inscripciones eliminadas.
+    """
+    return eliminar_inscripciones_de_miembros(directorio, {id_miembro})
+
+
+def eliminar_inscripciones_de_miembros(directorio: str, ids_miembros: Set[str]) -> int:
+    """
+    Elimina todas las inscripciones de varios miembros.
+
+    Cada partición afectada y el índice se reescriben una sola vez.
+
+    :return: Número de inscripciones eliminadas.
+    """
+    indice = cargar_indice_miembros(directorio)
+    afectadas: Set[str] = set()
+    for id_miembro in ids_miembros:
+        afectadas.update(indice.pop(id_miembro, []))
+    eliminadas = 0
+    for id_clase in sorted(afectadas):
+        inscripciones = cargar_particion(directorio, id_clase)
+        restantes = [
+            i for i in inscripciones if i.get("id_miembro") not in ids_miembros
+        ]
+        eliminadas += len(inscripciones) - len(restantes)
+        guardar_particion(directorio, id_clase, restantes)
+    guardar_indice_miembros(directorio, indice)
+    return eliminadas
+
+
+def reconstruir_indice(directorio: str) -> Dict[str, List[str]]:
+    """Reconstruye el índice de miembros a partir de las particiones."""
+    indice: Dict[str, List[str]] = {}
+    for insc in cargar_todas(directorio):
+        clases = indice.setdefault(str(insc.get("id_miembro")), [])
+        id_clase = str(insc.get("id_clase"))
+        if id_clase not in clases:
+            clases.append(id_clase)
+    guardar_indice_miembros(directorio, indice)
+    return indice
+
+
+def migrar_a_particiones(ruta_json: str, directorio: str) -> int:
+    """
+    Migra un `inscripciones.json` monolítico al formato particionado.
+
+    Las filas sin id_miembro o id_clase se descartan.
+
+    :return: Número de inscripciones migradas.
+    """
+    por_clase: Dict[str, List[Dict[str, Any]]] = {}
+    for insc in datos.cargar_datos(ruta_json):
+        if not insc.get("id_miembro") or not insc.get("id_clase"):
+            continue
+        id_clase = str(insc["id_clase"])
+        por_clase.setdefault(id_clase, []).append(
+            {"id_miembro": str(insc["id_miembro"]), "id_clase": id_clase}
+        )
+
+    os.makedirs(directorio, exist_ok=True)
+    for id_clase, inscripciones in por_clase.items():
+        guardar_particion(directorio, id_clase, inscripciones)
+    reconstruir_indice(directorio)
+    return sum(len(v) for v in por_clase.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Migra inscripciones.json al formato particionado por clase."
+    )
+    parser.add_argument("origen", help="Ruta a inscripciones.json")
+    parser.add_argument("destino", help="Directorio de particiones")
+    args = parser.parse_args()
+
+    total = migrar_a_particiones(args.origen, args.destino)
+    console.print(f"[green]{total} inscripciones migradas a {args.destino}.[/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Respaldos Incrementales.
+
+Toma instantáneas del directorio de datos guardando cada archivo como una
+lista de bloques identificados por su hash SHA-256. Los bloques se guardan una
+sola vez (`objetos/`), de modo que un respaldo nuevo solo escribe los bloques
+que cambiaron; los archivos cuyo tamaño y fecha de modificación no cambiaron
+desde la instantánea anterior ni siquiera se leen.
+
+Los cortes entre bloques se eligen por contenido (según el hash de las últimas
+líneas), así que insertar o borrar filas en medio de `inscripciones.json` solo
+cambia los bloques cercanos. Los bloques pueden comprimirse con zlib.
+
+Como `datos.guardar_datos` escribe de forma atómica, cada archivo se copia en
+una versión completa; de los logs de solo-anexado (`.jsonl`) se respalda hasta
+la última línea completa.
+
+Uso:
+
+    python respaldo.py crear [--info info] [--destino respaldos] [--comprimir]
+    python respaldo.py listar [--destino respaldos]
+    python respaldo.py restaurar [--fecha 2026-03-02T10:00] [--exacto]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+import crud
+import datos
+
+console = Console()
+
+RESPALDOS_DIR = "respaldos"
+FORMATO_ID = "%Y%m%dT%H%M%S%f"
+
+TAM_MIN_BLOQUE = 4 * 1024
+TAM_MAX_BLOQUE = 1024 * 1024
+MASCARA_CORTE = (1 << 5) - 1
+VENTANA_LINEAS = 3
+
+
+def dividir_en_bloques(contenido: bytes) -> List[bytes]:
+    """
+    Divide un contenido en bloques cortando solo en finales de línea.
+
+    Se corta cuando el hash de las últimas `VENTANA_LINEAS` líneas cumple la
+    máscara (y el bloque supera el tamaño mínimo) o al llegar al máximo.
+    """
+    bloques = []
+    inicio = pos = 0
+    ventana: List[bytes] = []
+    for linea in contenido.splitlines(keepends=True):
+        pos += len(linea)
+        ventana = [*ventana[-(VENTANA_LINEAS - 1) :], linea]
+        tam = pos - inicio
+        if tam >= TAM_MAX_BLOQUE or (
+            tam >= TAM_MIN_BLOQUE and zlib.crc32(b"".join(ventana)) & MASCARA_CORTE == 0
+        ):
+            bloques.append(contenido[inicio:pos])
+            inicio = pos
+    if inicio < len(contenido):
+        bloques.append(contenido[inicio:])
+    return bloques
+
+
+def _ruta_objeto(dir_respaldos: str, hash_bloque: str) -> str:
+    return os.path.join(dir_respaldos, "objetos", hash_bloque[:2], hash_bloque)
+
+
+def _escribir_binario(ruta: str, contenido: bytes) -> None:
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with datos.escritura_atomica(ruta, binario=True) as archivo:
+        archivo.write(contenido)
+
+
+def _guardar_bloque(dir_respaldos: str, bloque: bytes, comprimir: bool) -> bool:
+    """Guarda un bloque si no existe. Retorna True si fue escrito."""
+    hash_bloque = hashlib.sha256(bloque).hexdigest()
+    ruta = _ruta_objeto(dir_respaldos, hash_bloque)
+    if os.path.exists(ruta) or os.path.exists(ruta + ".z"):
+        return False
+    if comprimir:
+        _escribir_binario(ruta + ".z", zlib.compress(bloque))
+    else:
+        _escribir_binario(ruta, bloque)
+    return True
+
+
+def _leer_bloque(dir_respaldos: str, hash_bloque: str) -> bytes:
+    ruta = _ruta_objeto(dir_respaldos, hash_bloque)
+    if os.path.exists(ruta + ".z"):
+        with open(ruta + ".z", mode="rb") as archivo:
+            return zlib.decompress(archivo.read())
+    with open(ruta, mode="rb") as archivo:
+        return archivo.read()
+
+
+def _archivos_de_datos(info_dir: str, excluir: str) -> List[str]:
+    """Rutas relativas de los archivos a respaldar (sin ocultos ni `excluir`)."""
+    excluir = os.path.abspath(excluir)
+    relativas = []
+    for raiz, directorios, archivos in os.walk(info_dir):
+        directorios[:] = sorted(
+            d
+            for d in directorios
+            if not d.startswith(".")
+            and os.path.abspath(os.path.join(raiz, d)) != excluir
+        )
+        for nombre in sorted(archivos):
+            if not nombre.startswith("."):
+                ruta = os.path.join(raiz, nombre)
+                relativas.append(os.path.relpath(ruta, info_dir))
+    return relativas
+
+
+def listar_instantaneas(dir_respaldos: str = RESPALDOS_DIR) -> List[str]:
+    """Lista los IDs de instantánea, de la más antigua a la más reciente."""
+    directorio = os.path.join(dir_respaldos, "instantaneas")
+    if not os.path.isdir(directorio):
+        return []
+    return sorted(
+        nombre[: -len(".json")]
+        for nombre in os.listdir(directorio)
+        if nombre.endswith(".json")
+    )
+
+
+def cargar_instantanea(dir_respaldos: str, id_instantanea: str) -> Dict[str, Any]:
+    """Carga el manifiesto de una instantánea."""
+    ruta = os.path.join(dir_respaldos, "instantaneas", f"{id_instantanea}.json")
+    with open(ruta, mode="r", encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def crear_instantanea(
+    info_dir: str = crud.INFO_DIR,
+    dir_respaldos: str = RESPALDOS_DIR,
+    comprimir: bool = False,
+) -> Dict[str, Any]:
+    """
+    Crea una instantánea incremental del directorio de datos.
+
+    :param comprimir: Si es True, los bloques nuevos se guardan con zlib.
+    :return: El manifiesto, con estadísticas en la clave `estadisticas`
+        (archivos leídos, reutilizados, bloques y bytes nuevos).
+    """
+    ids = listar_instantaneas(dir_respaldos)
+    anterior = cargar_instantanea(dir_respaldos, ids[-1])["archivos"] if ids else {}
+
+    archivos: Dict[str, Dict[str, Any]] = {}
+    estadisticas = dict.fromkeys(
+        ("leidos", "reutilizados", "bloques_nuevos", "bytes_nuevos"), 0
+    )
+    for relativa in _archivos_de_datos(info_dir, dir_respaldos):
+        ruta = os.path.join(info_dir, relativa)
+        estado = os.stat(ruta)
+        previo = anterior.get(relativa)
+        if (
+            previo
+            and previo["mtime_ns"] == estado.st_mtime_ns
+            and previo["tamano_original"] == estado.st_size
+        ):
+            archivos[relativa] = previo
+            estadisticas["reutilizados"] += 1
+            continue
+
+        with open(ruta, mode="rb") as archivo:
+            contenido = archivo.read()
+        tamano_original = len(contenido)
+        if relativa.endswith(".jsonl"):
+            # Una línea a medio anexar se respalda en la próxima instantánea.
+            contenido = contenido[: contenido.rfind(b"\n") + 1]
+
+        hashes = []
+        for bloque in dividir_en_bloques(contenido):
+            hashes.append(hashlib.sha256(bloque).hexdigest())
+            if _guardar_bloque(dir_respaldos, bloque, comprimir):
+                estadisticas["bloques_nuevos"] += 1
+                estadisticas["bytes_nuevos"] += len(bloque)
+        archivos[relativa] = {
+            "mtime_ns": estado.st_mtime_ns,
+            "tamano_original": tamano_original,
+            "sha256": hashlib.sha256(contenido).hexdigest(),
+            "bloques": hashes,
+        }
+        estadisticas["leidos"] += 1
+
+    momento = datetime.now()
+    id_instantanea = momento.strftime(FORMATO_ID)
+    manifiesto = {
+        "id": id_instantanea,
+        "fecha": momento.isoformat(timespec="seconds"),
+        "archivos": archivos,
+        "estadisticas": estadisticas,
+    }
+    os.makedirs(os.path.join(dir_respaldos, "instantaneas"), exist_ok=True)
+    ruta = os.path.join(dir_respaldos, "instantaneas", f"{id_instantanea}.json")
+    with datos.escritura_atomica(ruta) as json_file:
+        json.dump(manifiesto, json_file, indent=4)
+    return manifiesto
+
+
+def restaurar(
+    destino: str = crud.INFO_DIR,
+    dir_respaldos: str = RESPALDOS_DIR,
+    hasta: Optional[datetime] = None,
+    exacto: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Restaura la última instantánea tomada hasta `hasta` (o la más reciente).
+
+    Cada archivo se verifica contra su SHA-256 y se reemplaza de forma atómica.
+
+    :param exacto: Si es True, borra del destino los archivos que no estaban
+        en la instantánea (p. ej. particiones creadas después).
+    :return: El manifiesto restaurado, o None si no hay instantánea.
+    :raises ValueError: Si un archivo reconstruido no coincide con su hash.
+    """
+    ids = listar_instantaneas(dir_respaldos)
+    if hasta is not None:
+        ids = [i for i in ids if datetime.strptime(i, FORMATO_ID) <= hasta]
+    if not ids:
+        return None
+    manifiesto = cargar_instantanea(dir_respaldos, ids[-1])
+
+    for relativa, entrada in manifiesto["archivos"].items():
+        contenido = b"".join(_leer_bloque(dir_respaldos, h) for h in entrada["bloques"])
+        if hashlib.sha256(contenido).hexdigest() != entrada["sha256"]:
+            raise ValueError(f"Respaldo corrupto para '{relativa}'.")
+        _escribir_binario(os.path.join(destino, relativa), contenido)
+
+    if exacto and os.path.isdir(destino):
+        for relativa in _archivos_de_datos(destino, dir_respaldos):
+            if relativa not in manifiesto["archivos"]:
+                os.remove(os.path.join(destino, relativa))
+
+    datos.limpiar_cache()
+    return manifiesto
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Respaldos incrementales.")
+    parser.add_argument("accion", choices=["crear", "listar", "restaurar"])
+    parser.add_argument("--info", default=crud.INFO_DIR, help="Directorio de datos")
+    parser.add_argument("--destino", default=RESPALDOS_DIR, help="Dir. de respaldos")
+    parser.add_argument("--comprimir", action="store_true")
+    parser.add_argument("--fecha", help="Restaurar al estado de esta fecha (ISO)")
+    parser.add_argument("--exacto", action="store_true")
+    args = parser.parse_args()
+
+    if args.accion == "crear":
+        manifiesto = crear_instantanea(args.info, args.destino, args.comprimir)
+        est = manifiesto["estadisticas"]
+        console.print(
+            f"[green]Instantánea {manifiesto['id']}: {est['leidos']} archivos "
+            f"leídos, {est['reutilizados']} sin cambios, "
+            f"{est['bloques_nuevos']} bloques nuevos ({est['bytes_nuevos']} B).[/green]"
+        )
+    elif args.accion == "listar":
+        tabla = Table(title="INSTANTÁNEAS", style="cyan")
+        tabla.add_column("ID", style="yellow")
+        tabla.add_column("Fecha")
+        tabla.add_column("Archivos", justify="center")
+        for id_instantanea in listar_instantaneas(args.destino):
+            manifiesto = cargar_instantanea(args.destino, id_instantanea)
+            tabla.add_row(
+                id_instantanea, manifiesto["fecha"], str(len(manifiesto["archivos"]))
+            )
+        console.print(tabla)
+    else:
+        hasta = datetime.fromisoformat(args.fecha) if args.fecha else None
+        manifiesto = restaurar(args.info, args.destino, hasta, args.exacto)
+        if manifiesto:
+            console.print(
+                f"[green]Restaurada la instantánea {manifiesto['id']}.[/green]"
+            )
+        else:
+            console.print("[red]No hay instantáneas para esa fecha.[/red]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Sedes.
+
+Una instalación puede servir varias sedes del gimnasio; cada sede es un
+directorio de datos con sus propios `miembros.csv`, `clases.csv` e
+inscripciones (ver `main.py --info`).
+
+Este módulo calcula un resumen por sede (capacidad, miembros, inscripciones)
+en un pool de procesos y los consolida en un reporte único.
+
+Uso:
+
+    python sedes.py sedes/ [--procesos N]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+import datos
+import particiones
+
+console = Console()
+
+CAMPOS_RESUMEN = ("miembros", "clases", "cupo_total", "inscripciones")
+
+
+def rutas_sede(info_dir: str) -> Dict[str, str]:
+    """Retorna las rutas de los archivos de datos de una sede."""
+    return {
+        "miembros": os.path.join(info_dir, "miembros.csv"),
+        "clases": os.path.join(info_dir, "clases.csv"),
+        "inscripciones": particiones.ruta_inscripciones(info_dir),
+    }
+
+
+def listar_sedes(raiz: str) -> List[str]:
+    """
+    Lista los directorios de sede dentro de `raiz`.
+
+    Se considera sede cualquier subdirectorio que contenga `miembros.csv` o
+    `clases.csv`.
+    """
+    if not os.path.isdir(raiz):
+        return []
+    sedes = []
+    for nombre in sorted(os.listdir(raiz)):
+        ruta = os.path.join(raiz, nombre)
+        if os.path.isfile(os.path.join(ruta, "miembros.csv")) or os.path.isfile(
+            os.path.join(ruta, "clases.csv")
+        ):
+            sedes.append(ruta)
+    return sedes
+
+
+def resumen_sede(info_dir: str) -> Dict[str, Any]:
+    """
+    Calcula el resumen de una sede sin modificar sus archivos.
+
+    :return: Diccionario con sede, miembros, clases, cupo_total e
+        inscripciones.
+    """
+    rutas = rutas_sede(info_dir)
+    miembros = clases = cupo_total = 0
+    if os.path.exists(rutas["miembros"]):
+        miembros = len(datos.cargar_datos(rutas["miembros"]))
+    if os.path.exists(rutas["clases"]):
+        for clase in datos.cargar_datos(rutas["clases"]):
+            clases += 1
+            try:
+                cupo_total += int(clase.get("cupo_maximo", 0))
+            except ValueError:
+                pass
+    inscripciones = sum(
+        1 for _ in particiones.iterar_inscripciones(rutas["inscripciones"])
+    )
+    return {
+        "sede": os.path.basename(os.path.normpath(info_dir)),
+        "miembros": miembros,
+        "clases": clases,
+        "cupo_total": cupo_total,
+        "inscripciones": inscripciones,
+    }
+
+
+def reporte_consolidado(
+    sedes: List[str], procesos: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Calcula el resumen de cada sede en paralelo y los combina.
+
+    :param sedes: Directorios de datos de cada sede.
+    :param procesos: Número de procesos; None usa el número de CPUs.
+    :return: Diccionario con `sedes` (lista de resúmenes) y `total`.
+    """
+    if procesos == 1 or len(sedes) <= 1:
+        resumenes = [resumen_sede(s) for s in sedes]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resumenes = list(pool.map(resumen_sede, sedes))
+
+    total: Dict[str, Any] = {"sede": "TOTAL"}
+    for campo in CAMPOS_RESUMEN:
+        total[campo] = sum(r[campo] for r in resumenes)
+    return {"sedes": resumenes, "total": total}
+
+
+def mostrar_reporte(reporte: Dict[str, Any]) -> None:
+    """Muestra el reporte consolidado en una tabla."""
+    tabla = Table(title="REPORTE CONSOLIDADO DE SEDES", style="cyan")
+    tabla.add_column("Sede", style="yellow")
+    for campo in CAMPOS_RESUMEN:
+        tabla.add_column(campo.replace("_", " ").capitalize(), justify="center")
+    tabla.add_column("Ocupación", justify="center")
+
+    for fila in [*reporte["sedes"], reporte["total"]]:
+        ocupacion = (
+            f"{fila['inscripciones'] / fila['cupo_total']:.0%}"
+            if fila["cupo_total"]
+            else "-"
+        )
+        tabla.add_row(fila["sede"], *(str(fila[c]) for c in CAMPOS_RESUMEN), ocupacion)
+    console.print(tabla)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reporte consolidado de sedes.")
+    parser.add_argument("raiz", help="Directorio que contiene una carpeta por sede")
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    sedes = listar_sedes(args.raiz)
+    if not sedes:
+        console.print(f"[yellow]No se encontraron sedes en '{args.raiz}'.[/yellow]")
+        return
+    mostrar_reporte(reporte_consolidado(sedes, args.procesos))
+
+
+if __name__ == "__main__":
+    main()
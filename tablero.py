@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Tablero en Vivo.
+
+Muestra los cupos disponibles por clase y se actualiza solo cuando cambian
+los archivos de datos. En cada ciclo se comparan firmas baratas (mtime y
+tamaño) de `clases.csv` y de las fuentes de inscripciones; solo se vuelve a
+leer la fuente que cambió (con inscripciones particionadas, únicamente la
+partición modificada), se aplica la diferencia de inscritos por clase a la
+ocupación en memoria y se recalculan solo las filas de las clases afectadas.
+"""
+
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, Set, Tuple
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+import datos
+import particiones
+
+console = Console()
+
+INTERVALO_SONDEO = 1.0
+
+
+def _fuentes_inscripciones(filepath_inscripciones: str) -> Dict[str, Tuple]:
+    """Retorna la firma de cada archivo que contiene inscripciones."""
+    if not particiones.es_particionado(filepath_inscripciones):
+        return {filepath_inscripciones: datos.firma_archivo(filepath_inscripciones)}
+
+    fuentes = {}
+    for id_clase in particiones.listar_ids_clases(filepath_inscripciones):
+        ruta = particiones.ruta_particion(filepath_inscripciones, id_clase)
+        fuentes[ruta] = datos.firma_archivo(ruta)
+    return fuentes
+
+
+def _inscritos_por_clase(ruta: str) -> Counter:
+    return Counter(
+        str(i.get("id_clase"))
+        for i in particiones.iterar_archivo(ruta, tolerante=True)
+        if isinstance(i, dict)
+    )
+
+
+def _cargar_clases(filepath_clases: str) -> Dict[str, Dict[str, Any]]:
+    clases = {}
+    if not os.path.exists(filepath_clases):
+        return clases
+    for clase in datos.cargar_datos(filepath_clases):
+        try:
+            cupo = int(clase.get("cupo_maximo", 0))
+        except ValueError:
+            continue
+        clases[clase.get("id_clase", "")] = {
+            "nombre": clase.get("nombre_clase", ""),
+            "instructor": clase.get("instructor", ""),
+            "cupos": cupo,
+        }
+    return clases
+
+
+def _fila(estado: Dict[str, Any], id_clase: str) -> Tuple[str, ...]:
+    clase = estado["clases"][id_clase]
+    inscritos = estado["ocupacion"].get(id_clase, 0)
+    disponibles = clase["cupos"] - inscritos
+    color = "green" if disponibles > 0 else "red"
+    return (
+        id_clase,
+        clase["nombre"],
+        clase["instructor"],
+        str(clase["cupos"]),
+        str(inscritos),
+        f"[{color}]{disponibles}[/{color}]",
+    )
+
+
+def crear_estado(filepath_clases: str, filepath_inscripciones: str) -> Dict[str, Any]:
+    """Crea el estado en memoria del tablero (vacío hasta sincronizar)."""
+    return {
+        "filepath_clases": filepath_clases,
+        "filepath_inscripciones": filepath_inscripciones,
+        "firma_clases": None,
+        "clases": {},
+        "firmas_fuentes": {},
+        "conteos_fuentes": {},
+        "ocupacion": Counter(),
+        "filas": {},
+    }
+
+
+def sincronizar(estado: Dict[str, Any]) -> Set[str]:
+    """
+    Aplica al estado los cambios ocurridos en los archivos desde la última
+    sincronización.
+
+    :return: IDs de las clases cuyas filas cambiaron (incluye las eliminadas).
+    """
+    afectadas: Set[str] = set()
+
+    firma_clases = datos.firma_archivo(estado["filepath_clases"])
+    if firma_clases != estado["firma_clases"]:
+        clases = _cargar_clases(estado["filepath_clases"])
+        afectadas.update(
+            id_clase
+            for id_clase in set(clases) | set(estado["clases"])
+            if clases.get(id_clase) != estado["clases"].get(id_clase)
+        )
+        estado["clases"] = clases
+        estado["firma_clases"] = firma_clases
+
+    fuentes = _fuentes_inscripciones(estado["filepath_inscripciones"])
+    firmas = estado["firmas_fuentes"]
+    for ruta in set(fuentes) | set(firmas):
+        if fuentes.get(ruta) == firmas.get(ruta):
+            continue
+        anterior = estado["conteos_fuentes"].pop(ruta, Counter())
+        nuevo = _inscritos_por_clase(ruta) if ruta in fuentes else Counter()
+        for id_clase in set(anterior) | set(nuevo):
+            delta = nuevo[id_clase] - anterior[id_clase]
+            if delta:
+                estado["ocupacion"][id_clase] += delta
+                afectadas.add(id_clase)
+        if ruta in fuentes:
+            estado["conteos_fuentes"][ruta] = nuevo
+            firmas[ruta] = fuentes[ruta]
+        else:
+            firmas.pop(ruta, None)
+
+    for id_clase in afectadas:
+        if id_clase in estado["clases"]:
+            estado["filas"][id_clase] = _fila(estado, id_clase)
+        else:
+            estado["filas"].pop(id_clase, None)
+    return afectadas
+
+
+def construir_tabla(estado: Dict[str, Any]) -> Table:
+    """Construye la tabla a partir de las filas ya calculadas."""
+    tabla = Table(title="CUPOS DISPONIBLES POR CLASE (EN VIVO)", style="cyan")
+    tabla.add_column("ID", justify="center")
+    tabla.add_column("Clase", justify="left")
+    tabla.add_column("Instructor", justify="center")
+    tabla.add_column("Cupos Totales", justify="center")
+    tabla.add_column("Inscritos", justify="center")
+    tabla.add_column("Disponibles", justify="center")
+    for id_clase in estado["clases"]:
+        tabla.add_row(*estado["filas"][id_clase])
+    tabla.caption = "Ctrl+C para salir"
+    return tabla
+
+
+def ejecutar_tablero(
+    filepath_clases: str,
+    filepath_inscripciones: str,
+    intervalo: float = INTERVALO_SONDEO,
+) -> None:
+    """
+    Muestra el tablero en vivo hasta que el usuario pulse Ctrl+C.
+
+    La pantalla solo se redibuja cuando alguna clase cambió.
+    """
+    estado = crear_estado(filepath_clases, filepath_inscripciones)
+    sincronizar(estado)
+    try:
+        with Live(construir_tabla(estado), console=console, auto_refresh=False) as live:
+            while True:
+                time.sleep(intervalo)
+                if sincronizar(estado):
+                    live.update(construir_tabla(estado), refresh=True)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,80 @@
+import pytest
+
+import analitica
+import crud
+
+DISTRIBUCION_ESPERADA = {
+    "tramos": {"0-25%": 1, "25-50%": 1, "50-75%": 0, "75-100%": 1, ">100%": 0},
+    "media": 0.5,
+    "mediana": 0.5,
+    "minimo": 0.0,
+    "maximo": 1.0,
+}
+
+
+def preparar_datos(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    m1 = crud.crear_miembro(path_m, "Ana", "Mensual")
+    m2 = crud.crear_miembro(path_m, "Luis", "Anual")
+    crud.crear_miembro(path_m, "Eva", "Anual")
+    c1 = crud.crear_clase(path_c, "Yoga", "Marta", 2)
+    c2 = crud.crear_clase(path_c, "Box", "Marta", 2)
+    crud.crear_clase(path_c, "Spinning", "Leo", 4)
+    for m in (m1, m2):
+        crud.inscribir_miembro_en_clase(
+            path_i, path_c, m["id_miembro"], c1["id_clase"], path_m
+        )
+    crud.inscribir_miembro_en_clase(
+        path_i, path_c, m1["id_miembro"], c2["id_clase"], path_m
+    )
+    return path_m, path_c, path_i
+
+
+def test_calcular_vistas(tmp_path):
+    vistas = analitica.calcular_vistas(*preparar_datos(tmp_path))
+    assert vistas["ocupacion_por_instructor"]["Marta"] == {
+        "clases": 2,
+        "cupo_total": 4,
+        "inscritos": 3,
+        "ocupacion": 0.75,
+    }
+    assert vistas["mezcla_suscripciones"] == {"Mensual": 1, "Anual": 2}
+    assert vistas["distribucion_clases_por_miembro"] == {0: 1, 1: 1, 2: 1}
+    assert vistas["distribucion_llenado"]["tramos"] == {
+        "0-25%": 1,
+        "25-50%": 1,
+        "50-75%": 0,
+        "75-100%": 1,
+        ">100%": 0,
+    }
+
+
+def test_calcular_vistas_sin_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr(analitica, "np", None)
+    vistas = analitica.calcular_vistas(*preparar_datos(tmp_path))
+    assert vistas["distribucion_llenado"] == DISTRIBUCION_ESPERADA
+
+
+def test_distribucion_llenado_con_numpy(monkeypatch):
+    np = pytest.importorskip("numpy")
+    tasas = [0.0, 0.25, 0.3, 0.5, 0.75, 1.0, 1.5]
+    monkeypatch.setattr(analitica, "np", None)
+    esperado = analitica._distribucion_llenado(tasas)
+    monkeypatch.setattr(analitica, "np", np)
+    resultado = analitica._distribucion_llenado(tasas)
+    assert resultado.pop("tramos") == esperado.pop("tramos")
+    assert resultado == pytest.approx(esperado)
+
+
+def test_obtener_vistas_se_invalida_al_cambiar_archivos(tmp_path):
+    path_m, path_c, path_i = preparar_datos(tmp_path)
+    analitica.invalidar_cache()
+    vistas = analitica.obtener_vistas(path_m, path_c, path_i)
+    assert analitica.obtener_vistas(path_m, path_c, path_i) is vistas
+
+    crud.crear_miembro(path_m, "Nuevo", "Mensual")
+    nuevas = analitica.obtener_vistas(path_m, path_c, path_i)
+    assert nuevas is not vistas
+    assert nuevas["mezcla_suscripciones"] == {"Mensual": 2, "Anual": 2}
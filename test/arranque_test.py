@@ -0,0 +1,29 @@
+import os
+import time
+
+import arranque
+import datos
+
+
+def test_iniciar_crea_y_precarga_archivos(tmp_path):
+    rutas = [
+        str(tmp_path / "info" / "miembros.csv"),
+        str(tmp_path / "info" / "clases.csv"),
+        str(tmp_path / "info" / "inscripciones.json"),
+    ]
+    informe = arranque.iniciar(*rutas)
+    assert all(os.path.exists(r) for r in rutas)
+
+    assert arranque.esperar_precarga(informe, timeout=5)
+    assert set(informe["precarga"]) == set(rutas)
+    assert rutas[0] in datos._cache
+    assert "id_miembro" in datos._cache[rutas[0]]["indices"]
+
+
+def test_iniciar_reporta_importacion_desde_el_inicio(tmp_path):
+    inicio = time.perf_counter()
+    informe = arranque.iniciar(str(tmp_path / "miembros.csv"), inicio=inicio)
+    arranque.marcar_menu(informe)
+    assert informe["inicio"] == inicio
+    assert informe["menu"] >= informe["importacion"] + informe["inicializacion"]
+    assert arranque.esperar_precarga(informe, timeout=5)
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import asistencia
+import datos
+
+
+def test_registrar_y_consultar_asistencias(tmp_path):
+    directorio = str(tmp_path / "asistencia")
+    asistencia.registrar_lote(
+        directorio,
+        [
+            ("1", "10", datetime(2026, 3, 2, 9, 5)),
+            ("2", "10", datetime(2026, 3, 2, 9, 40)),
+            ("1", "10", datetime(2026, 3, 3, 18, 0)),
+            ("1", "20", datetime(2026, 3, 3, 19, 0)),
+        ],
+    )
+    assert os.path.exists(asistencia.ruta_particion(directorio, date(2026, 3, 2)))
+    assert asistencia.asistencias_por_clase(directorio, "10") == {
+        "2026-03-02": 2,
+        "2026-03-03": 1,
+    }
+    assert asistencia.asistencias_por_clase(
+        directorio, "10", hasta=date(2026, 3, 2), por_hora=True
+    ) == {"2026-03-02T09": 2}
+    assert asistencia.asistencias_por_miembro(
+        directorio, "1", desde=date(2026, 3, 3)
+    ) == {"2026-03-03": 2}
+    assert asistencia.asistencias_por_miembro(directorio, "1", por_hora=True) == {
+        "2026-03-02T09": 1,
+        "2026-03-03T18": 1,
+        "2026-03-03T19": 1,
+    }
+
+
+def test_resumen_anterior_sin_agregados_se_reconstruye(tmp_path):
+    directorio = str(tmp_path / "asistencia")
+    asistencia.registrar_asistencia(directorio, "1", "10", datetime(2026, 3, 2, 9))
+    resumen = asistencia.actualizar_resumen(directorio)
+    del resumen["miembro_hora"]
+    datos.guardar_datos(os.path.join(directorio, asistencia.RESUMEN_FILE), resumen)
+
+    assert asistencia.asistencias_por_miembro(directorio, "1", por_hora=True) == {
+        "2026-03-02T09": 1
+    }
+    assert asistencia.asistencias_por_clase(directorio, "10") == {"2026-03-02": 1}
+
+
+def test_actualizar_resumen_es_incremental(tmp_path):
+    directorio = str(tmp_path / "asistencia")
+    momento = datetime(2026, 3, 2, 9, 0)
+    asistencia.registrar_asistencia(directorio, "1", "10", momento)
+    asistencia.actualizar_resumen(directorio)
+
+    ruta = asistencia.ruta_particion(directorio, momento.date())
+    with open(ruta, mode="a", encoding="utf-8") as f:
+        f.write('{"id_miembro": "2", "id_clase": "10", "mom')
+
+    resumen = asistencia.actualizar_resumen(directorio)
+    assert resumen["clase_dia"]["10"]["2026-03-02"] == 1
+
+    with open(ruta, mode="a", encoding="utf-8") as f:
+        f.write('ento": "2026-03-02T09:30:00"}\n')
+    resumen = asistencia.actualizar_resumen(directorio)
+    assert resumen["clase_dia"]["10"] == {"2026-03-02": 2}
+
+
+def test_actualizar_resumen_concurrente_no_cuenta_doble(tmp_path):
+    directorio = str(tmp_path / "asistencia")
+    eventos = [("1", "10", datetime(2026, 3, 2, 9, n)) for n in range(40)]
+    asistencia.registrar_lote(directorio, eventos)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(asistencia.actualizar_resumen, [directorio] * 16))
+    resumen = asistencia.cargar_resumen(directorio)
+    assert resumen["clase_dia"]["10"] == {"2026-03-02": len(eventos)}
+
+
+def test_tasa_asistencia_clase(tmp_path):
+    directorio = str(tmp_path / "asistencia")
+    path_i = str(tmp_path / "inscripciones.json")
+    datos.guardar_datos(
+        path_i,
+        [{"id_miembro": "1", "id_clase": "10"}, {"id_miembro": "2", "id_clase": "10"}],
+    )
+    asistencia.registrar_lote(
+        directorio,
+        [
+            ("1", "10", datetime(2026, 3, 2, 9, 0)),
+            ("2", "10", datetime(2026, 3, 2, 9, 0)),
+            ("1", "10", datetime(2026, 3, 4, 9, 0)),
+        ],
+    )
+    # 3 asistencias / (2 inscritos x 2 días con sesión).
+    tasa = 3 / (2 * 2)
+    assert asistencia.tasa_asistencia_clase(directorio, path_i, "10") == tasa
+    assert asistencia.resumen_por_clase(
+        directorio, path_i, ["10", "20"], hasta=date(2026, 3, 3)
+    ) == {
+        "10": {"sesiones": 1, "asistencias": 2, "tasa": 1.0},
+        "20": {"sesiones": 0, "asistencias": 0, "tasa": 0.0},
+    }
@@ -0,0 +1,65 @@
+import carga
+import datos
+
+
+def test_un_trabajador_no_viola_invariantes(tmp_path):
+    config = {
+        "trabajadores": 1,
+        "operaciones": 80,
+        "modo": "hilos",
+        "miembros": 20,
+        "clases": 3,
+        "cupo": 4,
+        "particionado": True,
+    }
+    reporte = carga.ejecutar_carga(str(tmp_path), config)
+    assert reporte["operaciones"] == config["operaciones"]
+    assert reporte["errores"] == []
+    assert all(not casos for casos in reporte["violaciones"].values())
+    assert (
+        reporte["latencias"]["inscribir"]["p99"]
+        >= (reporte["latencias"]["inscribir"]["p50"])
+    )
+
+
+def test_verificar_invariantes_detecta_violaciones(tmp_path):
+    rutas = carga.preparar_datos(
+        str(tmp_path), {**carga.CONFIG_POR_DEFECTO, "miembros": 3, "cupo": 1}
+    )
+    datos.guardar_datos(
+        rutas["inscripciones"],
+        [
+            {"id_miembro": "1", "id_clase": "1"},
+            {"id_miembro": "1", "id_clase": "1"},
+            {"id_miembro": "3", "id_clase": "2"},
+        ],
+    )
+    violaciones = carga.verificar_invariantes(
+        rutas, esperadas={("1", "1"), ("2", "2")}, eliminados={"3"}
+    )
+    assert violaciones == {
+        "sobrecupo": [("1", 2, 1)],
+        "duplicadas": [("1", "1")],
+        "perdidas": [("2", "2")],
+        "fantasma": [("3", "2")],
+        "revividos": ["3"],
+    }
+
+
+def test_percentil():
+    valores = [4.0, 1.0, 3.0, 2.0]
+    ordenados = sorted(valores)
+    assert carga.percentil([], 50) == 0.0
+    assert carga.percentil(valores, 50) == ordenados[1]
+    assert carga.percentil(valores, 99) == ordenados[-1]
+
+
+def test_escrituras_particionadas_concurrentes_sin_errores(tmp_path):
+    config = {
+        "trabajadores": 4,
+        "operaciones": 100,
+        "modo": "hilos",
+        "particionado": True,
+    }
+    reporte = carga.ejecutar_carga(str(tmp_path), config)
+    assert reporte["errores"] == []
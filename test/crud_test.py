@@ -38,11 +38,11 @@ def test_inscribir_miembro_en_clase(tmp_path):
     miembro = crud.crear_miembro(path_m, "Luisa", "Anual")
     clase = crud.crear_clase(path_c, "Pilates", "Carlos", 1)
     ok, msg = crud.inscribir_miembro_en_clase(
-        path_i, path_c, miembro["id_miembro"], clase["id_clase"]
+        path_i, path_c, miembro["id_miembro"], clase["id_clase"], path_m
     )
     assert ok is True
     ok2, msg2 = crud.inscribir_miembro_en_clase(
-        path_i, path_c, miembro["id_miembro"], clase["id_clase"]
+        path_i, path_c, miembro["id_miembro"], clase["id_clase"], path_m
     )
     assert ok2 is False
 
@@ -56,10 +56,22 @@ def test_cupo_maximo(tmp_path):
     m2 = crud.crear_miembro(path_m, "B", "Mensual")
     clase = crud.crear_clase(path_c, "Box", "Entrenador", 1)
     ok1, _ = crud.inscribir_miembro_en_clase(
-        path_i, path_c, m1["id_miembro"], clase["id_clase"]
+        path_i, path_c, m1["id_miembro"], clase["id_clase"], path_m
     )
     assert ok1 is True
     ok2, _ = crud.inscribir_miembro_en_clase(
-        path_i, path_c, m2["id_miembro"], clase["id_clase"]
+        path_i, path_c, m2["id_miembro"], clase["id_clase"], path_m
     )
     assert ok2 is False
+
+
+def test_no_inscribe_miembros_inactivos(tmp_path):
+    path_m, path_c, path_i = setup_paths(tmp_path)
+    vencido = crud.crear_miembro(path_m, "Ana", "Mensual", "2020-01-01")
+    clase = crud.crear_clase(path_c, "Yoga", "Eva", 5)
+    ok, msg = crud.inscribir_miembro_en_clase(
+        path_i, path_c, vencido["id_miembro"], clase["id_clase"], path_m
+    )
+    assert ok is False
+    assert "vencida" in msg
+    assert datos.cargar_datos(path_i) == []
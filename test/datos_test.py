@@ -18,3 +18,25 @@ def test_guardar_y_cargar_json(tmp_path):
     cargado = datos.cargar_datos(str(ruta))
     assert isinstance(cargado, list)
     assert cargado[0]["id_miembro"] == "1"
+
+
+def test_cargar_datos_usa_cache_y_detecta_cambios(tmp_path):
+    ruta = str(tmp_path / "info" / "miembros.csv")
+    datos.inicializar_archivo(ruta)
+    datos.guardar_datos(
+        ruta, [{"id_miembro": "1", "nombre": "Ana", "tipo_suscripcion": "Anual"}]
+    )
+    primera = datos.cargar_datos(ruta)
+    primera[0]["nombre"] = "Modificado"
+    assert datos.cargar_datos(ruta)[0]["nombre"] == "Ana"
+
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write("2,Luis,Mensual\n")
+    assert datos.indexar(ruta, "id_miembro")["2"]["nombre"] == "Luis"
+
+
+def test_firma_de_directorio_omite_ocultos(tmp_path):
+    (tmp_path / "clase_1.json").write_text("[]", encoding="utf-8")
+    firma = datos.firma_archivo(str(tmp_path))
+    (tmp_path / ".clase_1.json.tmp").write_text("[", encoding="utf-8")
+    assert datos.firma_archivo(str(tmp_path)) == firma
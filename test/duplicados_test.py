@@ -0,0 +1,88 @@
+import crud
+import datos
+import duplicados
+import particiones
+
+
+def test_claves_bloqueo_agrupan_variantes():
+    assert duplicados.claves_bloqueo("José Pérez") & duplicados.claves_bloqueo(
+        "Jose Peres"
+    )
+    assert not duplicados.claves_bloqueo("Ana Gómez") & duplicados.claves_bloqueo(
+        "Luis Torres"
+    )
+
+
+def test_detectar_duplicados(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    for nombre in [
+        "Javier Rodríguez",
+        "Xavier Rodriguez",
+        "Ana Gómez",
+        "Javier Rodriguez",
+        "Luis Torres",
+    ]:
+        crud.crear_miembro(path_m, nombre, "Mensual")
+
+    pares = duplicados.detectar_duplicados(path_m, procesos=2)
+    assert {(p["id_a"], p["id_b"]) for p in pares} >= {("1", "4")}
+    assert all("3" not in (p["id_a"], p["id_b"]) for p in pares)
+
+    similares = duplicados.buscar_similares(path_m, "Ana Gomes")
+    assert [s["id_miembro"] for s in similares] == ["3"]
+
+
+def test_fusionar_miembros(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    a = crud.crear_miembro(path_m, "Ana Gómez", "Mensual")
+    b = crud.crear_miembro(path_m, "Ana Gomez", "Mensual")
+    yoga = crud.crear_clase(path_c, "Yoga", "Eva", 5)
+    box = crud.crear_clase(path_c, "Box", "Leo", 5)
+    for miembro, clase in ((a, yoga), (b, yoga), (b, box)):
+        crud.inscribir_miembro_en_clase(
+            path_i, path_c, miembro["id_miembro"], clase["id_clase"], path_m
+        )
+
+    assert duplicados.fusionar_miembros(
+        path_m, path_i, a["id_miembro"], b["id_miembro"]
+    )
+    assert crud.buscar_miembro_por_id(path_m, b["id_miembro"]) is None
+    assert sorted(
+        (i["id_miembro"], i["id_clase"]) for i in datos.cargar_datos(path_i)
+    ) == [("1", "1"), ("1", "2")]
+
+
+def test_fusionar_miembros_particionado_actualiza_solo_su_indice(tmp_path, monkeypatch):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    directorio = str(tmp_path / "inscripciones")
+    particiones.crear_almacen(directorio)
+    a = crud.crear_miembro(path_m, "Ana Gómez", "Mensual")
+    b = crud.crear_miembro(path_m, "Ana Gomez", "Mensual")
+    otro = crud.crear_miembro(path_m, "Luis", "Mensual")
+    yoga = crud.crear_clase(path_c, "Yoga", "Eva", 5)
+    box = crud.crear_clase(path_c, "Box", "Leo", 5)
+    pilates = crud.crear_clase(path_c, "Pilates", "Eva", 5)
+    for miembro, clase in ((a, yoga), (b, yoga), (b, box), (otro, pilates)):
+        crud.inscribir_miembro_en_clase(
+            directorio, path_c, miembro["id_miembro"], clase["id_clase"], path_m
+        )
+
+    leidas = []
+    cargar_particion = particiones.cargar_particion
+    monkeypatch.setattr(
+        particiones,
+        "cargar_particion",
+        lambda d, id_clase: leidas.append(id_clase) or cargar_particion(d, id_clase),
+    )
+    assert duplicados.fusionar_miembros(
+        path_m, directorio, a["id_miembro"], b["id_miembro"]
+    )
+    assert pilates["id_clase"] not in leidas
+    monkeypatch.undo()
+
+    indice = particiones.cargar_indice_miembros(directorio)
+    assert indice == particiones.reconstruir_indice(directorio)
+    assert sorted(indice[a["id_miembro"]]) == [yoga["id_clase"], box["id_clase"]]
@@ -0,0 +1,74 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+import crud
+import datos
+import exportar
+
+
+def preparar_datos(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    m1 = crud.crear_miembro(path_m, "Ana", "Mensual")
+    m2 = crud.crear_miembro(path_m, "Luis", "Anual")
+    clase = crud.crear_clase(path_c, "Yoga", "Marta", 5)
+    for m in (m1, m2):
+        crud.inscribir_miembro_en_clase(
+            path_i, path_c, m["id_miembro"], clase["id_clase"], path_m
+        )
+    inscripciones = datos.cargar_datos(path_i)
+    inscripciones.append({"id_miembro": "99", "id_clase": clase["id_clase"]})
+    datos.guardar_datos(path_i, inscripciones)
+    return path_m, path_c, path_i
+
+
+def test_iterar_json_en_bloques_pequenos(tmp_path):
+    ruta = str(tmp_path / "inscripciones.json")
+    filas = [{"id_miembro": str(n), "id_clase": "1"} for n in range(50)]
+    datos.guardar_datos(ruta, filas)
+    assert list(datos.iterar_json(ruta, tam_bloque=7)) == filas
+
+
+def test_iterar_json_no_parte_escalares_entre_bloques(tmp_path):
+    ruta = tmp_path / "numeros.json"
+    ruta.write_text("[1222222, 5, true]", encoding="utf-8")
+    assert list(datos.iterar_json(str(ruta), tam_bloque=3)) == [1222222, 5, True]
+
+
+@pytest.mark.parametrize(
+    "contenido", ['[{"a": 1}, {"a": 2 oops}, {"a": 3}]', '[{"a": 1}, {"a"']
+)
+def test_iterar_json_archivo_corrupto(tmp_path, contenido):
+    ruta = tmp_path / "corrupto.json"
+    ruta.write_text(contenido, encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        list(datos.iterar_json(str(ruta), tam_bloque=4))
+
+
+def test_exportar_csv_gzip(tmp_path):
+    destino = str(tmp_path / "vista.csv.gz")
+    total = exportar.exportar_inscripciones(*preparar_datos(tmp_path), destino)
+    with gzip.open(destino, mode="rt", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert total == len(filas)
+    assert [f["nombre"] for f in filas] == ["Ana", "Luis"]
+    assert filas[0]["instructor"] == "Marta"
+
+
+def test_exportar_jsonl(tmp_path):
+    destino = str(tmp_path / "vista.jsonl")
+    exportar.exportar_inscripciones(*preparar_datos(tmp_path), destino)
+    with open(destino, encoding="utf-8") as f:
+        filas = [json.loads(linea) for linea in f]
+    assert filas[1]["tipo_suscripcion"] == "Anual"
+
+
+def test_exportar_formato_invalido(tmp_path):
+    with pytest.raises(ValueError):
+        exportar.exportar_inscripciones(
+            *preparar_datos(tmp_path), str(tmp_path / "vista.xml")
+        )
@@ -0,0 +1,119 @@
+import crud
+import datos
+import horarios
+
+
+def horario(dia, inicio, fin, sala):
+    return {"dia_semana": dia, "hora_inicio": inicio, "hora_fin": fin, "sala": sala}
+
+
+def test_buscar_choque_en_indice():
+    indice = horarios.nuevo_indice()
+    horarios.insertar(indice, (600, 660), "1")
+    horarios.insertar(indice, (300, 480), "2")
+    assert horarios.buscar_choque(indice, (650, 700)) == "1"
+    assert horarios.buscar_choque(indice, (400, 420)) == "2"
+    assert horarios.buscar_choque(indice, (660, 720)) is None
+    assert horarios.buscar_choque(indice, (600, 660), ignorar="1") is None
+
+
+def test_crear_clase_rechaza_sala_ocupada(tmp_path):
+    path_c = str(tmp_path / "clases.csv")
+    assert crud.crear_clase(
+        path_c, "Yoga", "Eva", 5, horario("Lunes", "08:00", "09:00", "A")
+    )
+    assert (
+        crud.crear_clase(
+            path_c, "Box", "Leo", 5, horario("Lunes", "08:30", "09:30", "A")
+        )
+        is None
+    )
+    assert crud.crear_clase(
+        path_c, "Box", "Leo", 5, horario("Lunes", "08:30", "09:30", "B")
+    )
+    assert crud.crear_clase(
+        path_c, "Pilates", "Ana", 5, horario("Lunes", "09:00", "10:00", "A")
+    )
+    assert (
+        crud.crear_clase(
+            path_c, "Spinning", "Ana", 5, horario("Lunes", "10:00", "09:00", "C")
+        )
+        is None
+    )
+
+
+def test_inscribir_rechaza_choque_de_horario(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    miembro = crud.crear_miembro(path_m, "Ana", "Mensual")
+    yoga = crud.crear_clase(
+        path_c, "Yoga", "Eva", 5, horario("Martes", "18:00", "19:00", "A")
+    )
+    box = crud.crear_clase(
+        path_c, "Box", "Leo", 5, horario("Martes", "18:30", "19:30", "B")
+    )
+    libre = crud.crear_clase(path_c, "Libre", "Leo", 5)
+
+    ok, _ = crud.inscribir_miembro_en_clase(
+        path_i, path_c, miembro["id_miembro"], yoga["id_clase"], path_m
+    )
+    assert ok is True
+    ok, mensaje = crud.inscribir_miembro_en_clase(
+        path_i, path_c, miembro["id_miembro"], box["id_clase"], path_m
+    )
+    assert ok is False
+    assert "choca" in mensaje
+    ok, _ = crud.inscribir_miembro_en_clase(
+        path_i, path_c, miembro["id_miembro"], libre["id_clase"], path_m
+    )
+    assert ok is True
+
+    crud.dar_baja_miembro_de_clase(path_i, miembro["id_miembro"], yoga["id_clase"])
+    ok, _ = crud.inscribir_miembro_en_clase(
+        path_i, path_c, miembro["id_miembro"], box["id_clase"], path_m
+    )
+    assert ok is True
+
+
+def test_indice_de_miembro_no_queda_obsoleto_tras_una_baja(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    miembro = crud.crear_miembro(path_m, "Ana", "Mensual")["id_miembro"]
+    yoga = crud.crear_clase(
+        path_c, "Yoga", "Eva", 5, horario("Martes", "18:00", "19:00", "A")
+    )["id_clase"]
+    box = crud.crear_clase(
+        path_c, "Box", "Leo", 5, horario("Martes", "18:30", "19:30", "B")
+    )["id_clase"]
+    libre = crud.crear_clase(path_c, "Libre", "Leo", 5)["id_clase"]
+
+    assert crud.inscribir_miembro_en_clase(path_i, path_c, miembro, yoga, path_m)[0]
+    en_cache = horarios._cache_miembros[(path_i, path_c)]
+    assert crud.dar_baja_miembro_de_clase(path_i, miembro, yoga)
+    # La baja actualiza el índice en memoria en lugar de descartarlo.
+    assert horarios._cache_miembros[(path_i, path_c)] is en_cache
+
+    # Una clase sin horario no consulta el índice antes de inscribir.
+    assert crud.inscribir_miembro_en_clase(path_i, path_c, miembro, libre, path_m)[0]
+    ok, mensaje = crud.inscribir_miembro_en_clase(path_i, path_c, miembro, box, path_m)
+    assert ok is True, mensaje
+
+
+def test_registrar_inscripcion_descarta_indice_obsoleto(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    yoga = crud.crear_clase(
+        path_c, "Yoga", "Eva", 5, horario("Martes", "18:00", "19:00", "A")
+    )
+    crud.inscribir_miembro_en_clase(path_i, path_c, "1", yoga["id_clase"], path_m)
+    assert (path_i, path_c) in horarios._cache_miembros
+
+    # Escritura externa: el índice en caché ya no corresponde al archivo.
+    datos.guardar_datos(path_i, [])
+    firma_previa = datos.firma_archivo(path_i)
+    datos.guardar_datos(path_i, [{"id_miembro": "2", "id_clase": "9"}])
+    horarios.registrar_inscripcion(path_i, path_c, "2", {"id_clase": "9"}, firma_previa)
+    assert (path_i, path_c) not in horarios._cache_miembros
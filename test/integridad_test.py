@@ -0,0 +1,107 @@
+import os
+
+import datos
+import integridad
+import particiones
+
+
+def preparar_datos(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    datos.inicializar_archivos(path_m, path_c, path_i)
+    datos.guardar_datos(
+        path_m,
+        [
+            {"id_miembro": "1", "nombre": "Ana", "tipo_suscripcion": "Mensual"},
+            {"id_miembro": "2", "nombre": "Luis", "tipo_suscripcion": "Anual"},
+            {"id_miembro": "3", "nombre": "", "tipo_suscripcion": "Anual"},
+        ],
+    )
+    datos.guardar_datos(
+        path_c,
+        [
+            {
+                "id_clase": "1",
+                "nombre_clase": "Yoga",
+                "instructor": "Eva",
+                "cupo_maximo": "1",
+            },
+            {
+                "id_clase": "2",
+                "nombre_clase": "Box",
+                "instructor": "Leo",
+                "cupo_maximo": "5",
+            },
+        ],
+    )
+    datos.guardar_datos(
+        path_i,
+        [
+            {"id_miembro": "1", "id_clase": "1"},
+            {"id_miembro": "2", "id_clase": "1"},
+            {"id_miembro": "1", "id_clase": "2"},
+            {"id_miembro": "1", "id_clase": "2"},
+            {"id_miembro": "9", "id_clase": "2"},
+            {"id_miembro": "2", "id_clase": "7"},
+            {"id_miembro": "3", "id_clase": "2"},
+            {"id_miembro": "2"},
+        ],
+    )
+    return path_m, path_c, path_i
+
+
+TIPOS_ESPERADOS = sorted(
+    [
+        integridad.MALFORMADA,
+        integridad.MALFORMADA,
+        integridad.HUERFANA_MIEMBRO,
+        integridad.HUERFANA_CLASE,
+        integridad.DUPLICADA,
+        integridad.SOBRE_CUPO,
+    ]
+)
+
+
+def test_verificar_integridad_detecta_problemas(tmp_path):
+    path_m, path_c, path_i = preparar_datos(tmp_path)
+    hallazgos = integridad.verificar_integridad(path_m, path_c, path_i)
+    assert sorted(h["tipo"] for h in hallazgos) == TIPOS_ESPERADOS
+
+
+def test_verificar_integridad_particionado_en_procesos(tmp_path):
+    path_m, path_c, path_i = preparar_datos(tmp_path)
+    directorio = str(tmp_path / "inscripciones")
+    por_clase = {}
+    for insc in datos.cargar_datos(path_i):
+        por_clase.setdefault(insc.get("id_clase", "2"), []).append(insc)
+    particiones.crear_almacen(directorio)
+    for id_clase, filas in por_clase.items():
+        particiones.guardar_particion(directorio, id_clase, filas)
+
+    hallazgos = integridad.verificar_integridad(path_m, path_c, directorio, procesos=2)
+    assert sorted(h["tipo"] for h in hallazgos) == TIPOS_ESPERADOS
+    assert {
+        h["archivo"] for h in hallazgos if h["tipo"] == integridad.HUERFANA_CLASE
+    } == {os.path.join("inscripciones", "clase_7.json")}
+
+    integridad.verificar_integridad(path_m, path_c, directorio, reparar=True)
+    assert sorted(
+        (i["id_miembro"], i["id_clase"]) for i in particiones.cargar_todas(directorio)
+    ) == [("1", "1"), ("1", "2"), ("3", "2")]
+
+
+def test_verificar_integridad_reparar(tmp_path):
+    path_m, path_c, path_i = preparar_datos(tmp_path)
+    miembros = datos.cargar_datos(path_m)
+    integridad.verificar_integridad(path_m, path_c, path_i, reparar=True)
+    # El miembro malformado (sin nombre) se reporta pero no se borra, y
+    # conserva sus inscripciones.
+    assert datos.cargar_datos(path_m) == miembros
+    assert datos.cargar_datos(path_i) == [
+        {"id_miembro": "1", "id_clase": "1"},
+        {"id_miembro": "1", "id_clase": "2"},
+        {"id_miembro": "3", "id_clase": "2"},
+    ]
+    restantes = integridad.verificar_integridad(path_m, path_c, path_i)
+    assert [h["tipo"] for h in restantes] == [integridad.MALFORMADA]
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+import crud
+import datos
+import particiones
+
+
+def test_migrar_a_particiones(tmp_path):
+    ruta_json = str(tmp_path / "inscripciones.json")
+    directorio = str(tmp_path / "inscripciones")
+    datos.inicializar_archivo(ruta_json)
+    validas = [
+        {"id_miembro": "1", "id_clase": "10"},
+        {"id_miembro": "2", "id_clase": "10"},
+        {"id_miembro": "1", "id_clase": "20"},
+    ]
+    datos.guardar_datos(ruta_json, [*validas, {"id_miembro": "", "id_clase": "20"}])
+    total = particiones.migrar_a_particiones(ruta_json, directorio)
+    assert total == len(validas)
+    assert particiones.cargar_particion(directorio, "10") == validas[:2]
+    assert sorted(particiones.clases_de_miembro(directorio, "1")) == ["10", "20"]
+
+
+def test_crud_con_particiones(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    directorio = str(tmp_path / "inscripciones")
+    particiones.crear_almacen(directorio)
+    m1 = crud.crear_miembro(path_m, "Ana", "Mensual")
+    m2 = crud.crear_miembro(path_m, "Luis", "Anual")
+    c1 = crud.crear_clase(path_c, "Yoga", "Eva", 1)
+    c2 = crud.crear_clase(path_c, "Box", "Leo", 5)
+
+    ok, _ = crud.inscribir_miembro_en_clase(
+        directorio, path_c, m1["id_miembro"], c1["id_clase"], path_m
+    )
+    assert ok is True
+    ok, _ = crud.inscribir_miembro_en_clase(
+        directorio, path_c, m2["id_miembro"], c1["id_clase"], path_m
+    )
+    assert ok is False
+    crud.inscribir_miembro_en_clase(directorio, path_c, m1["id_miembro"], "2", path_m)
+    crud.inscribir_miembro_en_clase(directorio, path_c, m2["id_miembro"], "2", path_m)
+
+    clases = crud.listar_clases_inscritas_por_miembro(
+        directorio, path_c, m1["id_miembro"]
+    )
+    assert {c["id_clase"] for c in clases} == {"1", "2"}
+
+    assert crud.dar_baja_miembro_de_clase(directorio, m2["id_miembro"], "2")
+    assert crud.eliminar_miembro(path_m, m1["id_miembro"], directorio)
+    assert particiones.cargar_todas(directorio) == []
+    assert not os.path.exists(particiones.ruta_particion(directorio, c2["id_clase"]))
+
+
+def test_ruta_particionada_inexistente_falla(tmp_path):
+    path_c = str(tmp_path / "clases.csv")
+    path_m = str(tmp_path / "miembros.csv")
+    clase = crud.crear_clase(path_c, "Yoga", "Eva", 5)
+    miembro = crud.crear_miembro(path_m, "Ana", "Mensual")
+    mal_escrita = str(tmp_path / "inscripcion")
+    with pytest.raises(FileNotFoundError):
+        crud.inscribir_miembro_en_clase(
+            mal_escrita, path_c, miembro["id_miembro"], clase["id_clase"], path_m
+        )
+    assert not os.path.exists(mal_escrita)
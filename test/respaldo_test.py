@@ -0,0 +1,57 @@
+import os
+import stat
+
+import crud
+import datos
+import respaldo
+
+
+def test_instantanea_incremental_y_restauracion(tmp_path):
+    info = tmp_path / "info"
+    destino = str(tmp_path / "respaldos")
+    path_m = str(info / "miembros.csv")
+    path_i = str(info / "inscripciones.json")
+    datos.inicializar_archivo(path_m)
+    datos.inicializar_archivo(path_i)
+    for n in range(300):
+        crud.crear_miembro(path_m, f"Miembro {n}", "Mensual")
+    miembros = datos.cargar_datos(path_m)
+    datos.guardar_datos(
+        path_i, [{"id_miembro": str(n), "id_clase": "1"} for n in range(1, 2000)]
+    )
+
+    primera = respaldo.crear_instantanea(str(info), destino, comprimir=True)
+    assert primera["estadisticas"]["leidos"] == len([path_m, path_i])
+    bloques_iniciales = primera["estadisticas"]["bloques_nuevos"]
+
+    inscripciones = datos.cargar_datos(path_i)
+    mitad = len(inscripciones) // 2
+    inscripciones.insert(mitad, {"id_miembro": "9999", "id_clase": "2"})
+    datos.guardar_datos(path_i, inscripciones)
+    segunda = respaldo.crear_instantanea(str(info), destino)
+    assert segunda["estadisticas"]["reutilizados"] == 1
+    assert 0 < segunda["estadisticas"]["bloques_nuevos"] < bloques_iniciales / 2
+
+    os.remove(path_m)
+    datos.guardar_datos(path_i, [])
+    (info / "sobrante.json").write_text("[]")
+    assert respaldo.restaurar(str(info), destino, exacto=True)["id"] == segunda["id"]
+    assert datos.cargar_datos(path_m) == miembros
+    assert datos.cargar_datos(path_i) == inscripciones
+    # Los archivos restaurados respetan la umask, no el 0600 de mkstemp.
+    modo = stat.S_IMODE(os.stat(path_m).st_mode)
+    assert modo == 0o666 & ~datos._UMASK
+    assert not (info / "sobrante.json").exists()
+    assert respaldo.listar_instantaneas(destino) == [primera["id"], segunda["id"]]
+
+
+def test_jsonl_se_respalda_hasta_la_ultima_linea_completa(tmp_path):
+    info = tmp_path / "info"
+    info.mkdir()
+    destino = str(tmp_path / "respaldos")
+    (info / "log.jsonl").write_bytes(b'{"a": 1}\n{"a": 2')
+
+    respaldo.crear_instantanea(str(info), destino)
+    (info / "log.jsonl").unlink()
+    respaldo.restaurar(str(info), destino)
+    assert (info / "log.jsonl").read_bytes() == b'{"a": 1}\n'
@@ -0,0 +1,53 @@
+import crud
+import sedes
+
+
+def crear_sede(raiz, nombre, n_miembros, cupo):
+    info = raiz / nombre
+    rutas = sedes.rutas_sede(str(info))
+    clase = crud.crear_clase(rutas["clases"], "Yoga", "Eva", cupo)
+    for n in range(n_miembros):
+        miembro = crud.crear_miembro(rutas["miembros"], f"Miembro {n}", "Mensual")
+        crud.inscribir_miembro_en_clase(
+            rutas["inscripciones"],
+            rutas["clases"],
+            miembro["id_miembro"],
+            clase["id_clase"],
+            rutas["miembros"],
+        )
+    return str(info)
+
+
+def test_reporte_consolidado(tmp_path):
+    crear_sede(tmp_path, "centro", 2, 10)
+    crear_sede(tmp_path, "norte", 3, 5)
+    (tmp_path / "vacio").mkdir()
+
+    lista = sedes.listar_sedes(str(tmp_path))
+    assert [s.rsplit("/", 1)[-1] for s in lista] == ["centro", "norte"]
+
+    reporte = sedes.reporte_consolidado(lista, procesos=2)
+    assert reporte["total"] == {
+        "sede": "TOTAL",
+        "miembros": 5,
+        "clases": 2,
+        "cupo_total": 15,
+        "inscripciones": 5,
+    }
+
+
+def test_ver_cupos_disponibles_usa_rutas_recibidas(tmp_path, capsys):
+    info = crear_sede(tmp_path, "sur", 1, 4)
+    rutas = sedes.rutas_sede(info)
+    crud.ver_cupos_disponibles(rutas["clases"], rutas["inscripciones"])
+    salida = capsys.readouterr().out
+    assert "Yoga" in salida
+
+
+def test_ver_cupos_disponibles_con_inscripciones_corruptas(tmp_path, capsys):
+    info = crear_sede(tmp_path, "oeste", 0, 4)
+    rutas = sedes.rutas_sede(info)
+    with open(rutas["inscripciones"], "w", encoding="utf-8") as archivo:
+        archivo.write('[{"id_miembro": "1", "id_clase": "1"},')
+    crud.ver_cupos_disponibles(rutas["clases"], rutas["inscripciones"])
+    assert "Yoga" in capsys.readouterr().out
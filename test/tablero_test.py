@@ -0,0 +1,47 @@
+import crud
+import particiones
+import tablero
+
+
+def test_sincronizar_aplica_solo_los_cambios(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    directorio = str(tmp_path / "inscripciones")
+    particiones.crear_almacen(directorio)
+    m1 = crud.crear_miembro(path_m, "Ana", "Mensual")
+    m2 = crud.crear_miembro(path_m, "Luis", "Anual")
+    yoga = crud.crear_clase(path_c, "Yoga", "Eva", 2)
+    box = crud.crear_clase(path_c, "Box", "Leo", 3)
+    crud.inscribir_miembro_en_clase(
+        directorio, path_c, m1["id_miembro"], yoga["id_clase"], path_m
+    )
+
+    estado = tablero.crear_estado(path_c, directorio)
+    assert tablero.sincronizar(estado) == {yoga["id_clase"], box["id_clase"]}
+    assert estado["ocupacion"][yoga["id_clase"]] == 1
+    assert tablero.sincronizar(estado) == set()
+
+    crud.inscribir_miembro_en_clase(
+        directorio, path_c, m2["id_miembro"], box["id_clase"], path_m
+    )
+    assert tablero.sincronizar(estado) == {box["id_clase"]}
+    assert estado["filas"][box["id_clase"]][4] == "1"
+
+    crud.dar_baja_miembro_de_clase(directorio, m1["id_miembro"], yoga["id_clase"])
+    assert tablero.sincronizar(estado) == {yoga["id_clase"]}
+    assert estado["ocupacion"][yoga["id_clase"]] == 0
+    assert tablero.construir_tabla(estado).row_count == len([yoga, box])
+
+
+def test_sincronizar_tolera_particiones_corruptas(tmp_path):
+    path_c = str(tmp_path / "clases.csv")
+    directorio = tmp_path / "inscripciones"
+    yoga = crud.crear_clase(path_c, "Yoga", "Eva", 2)
+    directorio.mkdir()
+    (directorio / f"clase_{yoga['id_clase']}.json").write_text(
+        '[{"id_miembro": "1", "id_clase": "1"},', encoding="utf-8"
+    )
+
+    estado = tablero.crear_estado(path_c, str(directorio))
+    assert tablero.sincronizar(estado) == {yoga["id_clase"]}
+    assert tablero.construir_tabla(estado).row_count == 1
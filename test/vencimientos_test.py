@@ -0,0 +1,111 @@
+from datetime import date
+
+import crud
+import datos
+import particiones
+import vencimientos
+
+
+def test_sumar_meses_ajusta_fin_de_mes():
+    assert vencimientos.sumar_meses(date(2026, 1, 31), 1) == date(2026, 2, 28)
+    assert vencimientos.sumar_meses(date(2024, 2, 29), 12) == date(2025, 2, 28)
+    assert vencimientos.sumar_meses(date(2026, 12, 15), 1) == date(2027, 1, 15)
+
+
+def test_por_vencer_y_actualizacion_del_indice(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    hoy = date.today()
+    ana = crud.crear_miembro(path_m, "Ana", "Mensual")
+    luis = crud.crear_miembro(path_m, "Luis", "Anual")
+    assert ana["fecha_vencimiento"] == vencimientos.sumar_meses(hoy, 1).isoformat()
+
+    dias = (date.fromisoformat(ana["fecha_vencimiento"]) - hoy).days
+    assert vencimientos.por_vencer(path_m, dias, hoy) == [
+        (ana["fecha_vencimiento"], ana["id_miembro"])
+    ]
+    assert vencimientos.por_vencer(path_m, dias - 1, hoy) == []
+
+    # La renovación a anual se refleja sin releer el archivo.
+    crud.actualizar_miembro(path_m, ana["id_miembro"], {"tipo_suscripcion": "Anual"})
+    assert vencimientos.por_vencer(path_m, dias, hoy) == []
+    assert [i for _, i in vencimientos.por_vencer(path_m, 366, hoy)] == [
+        ana["id_miembro"],
+        luis["id_miembro"],
+    ]
+    vencimientos.invalidar_cache()
+    assert len(vencimientos.por_vencer(path_m, 366, hoy)) == len([ana, luis])
+
+
+def test_indice_no_queda_obsoleto_tras_eliminar_o_reescribir(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    ana = crud.crear_miembro(path_m, "Ana", "Mensual")
+    luis = crud.crear_miembro(path_m, "Luis", "Mensual")
+    vencimientos.por_vencer(path_m, 31)
+
+    crud.eliminar_miembro(path_m, ana["id_miembro"], path_i)
+    eva = crud.crear_miembro(path_m, "Eva", "Mensual")
+    assert [i for _, i in vencimientos.por_vencer(path_m, 31)] == [
+        luis["id_miembro"],
+        eva["id_miembro"],
+    ]
+
+    # Una escritura ajena a crud (p. ej. una fusión) deja el índice atrasado:
+    # el alta siguiente debe descartarlo en lugar de parchearlo.
+    datos.guardar_datos(path_m, [m for m in datos.cargar_datos(path_m) if m != luis])
+    crud.crear_miembro(path_m, "Teo", "Mensual")
+    assert luis["id_miembro"] not in [i for _, i in vencimientos.por_vencer(path_m, 31)]
+
+
+def test_barrer_vencidos(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    directorio = str(tmp_path / "inscripciones")
+    particiones.crear_almacen(directorio)
+    vencido = crud.crear_miembro(path_m, "Ana", "Mensual")
+    vigente = crud.crear_miembro(path_m, "Luis", "Anual")
+    for nombre in ("Yoga", "Box"):
+        clase = crud.crear_clase(path_c, nombre, "Eva", 5)
+        for miembro in (vencido, vigente):
+            crud.inscribir_miembro_en_clase(
+                directorio, path_c, miembro["id_miembro"], clase["id_clase"], path_m
+            )
+
+    # Simula un miembro que venció después del último barrido.
+    crud.actualizar_miembro(
+        path_m, vencido["id_miembro"], {"fecha_inicio": "2020-01-10"}
+    )
+    miembros = datos.cargar_datos(path_m)
+    assert miembros[0]["activo"] == vencimientos.INACTIVO
+    miembros[0]["activo"] = vencimientos.ACTIVO
+    datos.guardar_datos(path_m, miembros)
+
+    assert vencimientos.barrer_vencidos(path_m, directorio) == {
+        "desactivados": 1,
+        "inscripciones": 2,
+    }
+    assert {i["id_miembro"] for i in particiones.cargar_todas(directorio)} == {
+        vigente["id_miembro"]
+    }
+    assert particiones.clases_de_miembro(directorio, vencido["id_miembro"]) == []
+    assert crud.buscar_miembro_por_id(path_m, vencido["id_miembro"])["activo"] == "no"
+    assert vencimientos.vencidos(path_m) == []
+    assert vencimientos.barrer_vencidos(path_m, directorio)["desactivados"] == 0
+
+
+def test_no_inscribe_vencidos_antes_del_barrido(tmp_path):
+    path_m = str(tmp_path / "miembros.csv")
+    path_c = str(tmp_path / "clases.csv")
+    path_i = str(tmp_path / "inscripciones.json")
+    miembro = crud.crear_miembro(path_m, "Ana", "Mensual", "2020-01-10")
+    miembros = datos.cargar_datos(path_m)
+    miembros[0]["activo"] = vencimientos.ACTIVO
+    datos.guardar_datos(path_m, miembros)
+    assert not vencimientos.esta_vigente(miembros[0])
+
+    clase = crud.crear_clase(path_c, "Yoga", "Eva", 5)
+    ok, mensaje = crud.inscribir_miembro_en_clase(
+        path_i, path_c, miembro["id_miembro"], clase["id_clase"], path_m
+    )
+    assert ok is False
+    assert "vencida" in mensaje
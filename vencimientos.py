@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Vencimientos de Suscripciones.
+
+Cada miembro tiene una fecha de inicio y una de vencimiento (ISO, AAAA-MM-DD)
+calculada según su tipo de suscripción, y un campo `activo` ("si"/"no").
+
+Los miembros activos se mantienen en un índice ordenado por fecha de
+vencimiento, así que "quién vence en los próximos 7 días" se responde con dos
+búsquedas binarias en lugar de recorrer todo el padrón. El índice se
+reconstruye cuando cambia `miembros.csv` y se actualiza en memoria tras cada
+alta, modificación o baja hecha desde `crud`.
+
+El barrido desactiva a los miembros vencidos y elimina sus inscripciones,
+escribiendo cada archivo una sola vez.
+
+Uso:
+
+    python vencimientos.py [--dias 7] [--barrer] [--info info]
+"""
+
+import argparse
+import bisect
+import calendar
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+import datos
+import particiones
+
+console = Console()
+
+# Meses que cubre cada tipo de suscripción.
+DURACION_MESES = {"Mensual": 1, "Anual": 12}
+ACTIVO = "si"
+INACTIVO = "no"
+
+# {filepath: {"firma", "entradas": [(fecha_vencimiento, id_miembro)], "por_id"}}
+_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def leer_fecha(texto: str) -> Optional[date]:
+    """Convierte una fecha ISO (AAAA-MM-DD) en `date`; None si no es válida."""
+    try:
+        return date.fromisoformat((texto or "").strip())
+    except ValueError:
+        return None
+
+
+def sumar_meses(fecha: date, meses: int) -> date:
+    """Suma meses a una fecha, ajustando el día al último del mes si hace falta."""
+    total = fecha.month - 1 + meses
+    anio, mes = fecha.year + total // 12, total % 12 + 1
+    dia = min(fecha.day, calendar.monthrange(anio, mes)[1])
+    return date(anio, mes, dia)
+
+
+def calcular_vencimiento(fecha_inicio: date, tipo_suscripcion: str) -> date:
+    """Fecha de vencimiento de una suscripción que empieza en `fecha_inicio`."""
+    return sumar_meses(fecha_inicio, DURACION_MESES[tipo_suscripcion])
+
+
+def esta_activo(miembro: Dict[str, Any]) -> bool:
+    """Los miembros sin el campo `activo` (archivos anteriores) cuentan como activos."""
+    return (miembro.get("activo") or ACTIVO) != INACTIVO
+
+
+def esta_vigente(miembro: Dict[str, Any], hoy: Optional[date] = None) -> bool:
+    """
+    Indica si un miembro puede usar su suscripción hoy: está activo y su
+    vencimiento (si lo tiene) no es anterior a hoy, aunque el barrido todavía
+    no lo haya desactivado.
+    """
+    if not esta_activo(miembro):
+        return False
+    vencimiento = leer_fecha(miembro.get("fecha_vencimiento"))
+    return vencimiento is None or vencimiento >= (hoy or date.today())
+
+
+def _entrada(miembro: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    if not esta_activo(miembro) or not leer_fecha(miembro.get("fecha_vencimiento")):
+        return None
+    return (miembro["fecha_vencimiento"].strip(), miembro.get("id_miembro", ""))
+
+
+def indice_vencimientos(filepath_miembros: str) -> Dict[str, Any]:
+    """
+    Retorna el índice de vencimientos de los miembros activos.
+
+    :return: {"entradas": [(fecha_vencimiento, id_miembro)] ordenadas,
+        "por_id": {id_miembro: fecha_vencimiento}}.
+    """
+    firma = datos.firma_archivo(filepath_miembros)
+    en_cache = _cache.get(filepath_miembros)
+    if en_cache and en_cache["firma"] == firma:
+        return en_cache
+
+    entradas = []
+    for miembro in datos.cargar_datos(filepath_miembros):
+        entrada = _entrada(miembro)
+        if entrada:
+            entradas.append(entrada)
+    entradas.sort()
+    indice = {
+        "firma": firma,
+        "entradas": entradas,
+        "por_id": {id_miembro: fecha for fecha, id_miembro in entradas},
+    }
+    _cache[filepath_miembros] = indice
+    return indice
+
+
+def _quitar(indice: Dict[str, Any], id_miembro: str) -> None:
+    fecha = indice["por_id"].pop(id_miembro, None)
+    if fecha is not None:
+        pos = bisect.bisect_left(indice["entradas"], (fecha, id_miembro))
+        del indice["entradas"][pos]
+
+
+def _indice_al_dia(filepath_miembros: str, firma_previa: Tuple) -> Optional[Dict]:
+    """
+    Índice en caché si estaba al día justo antes de una escritura (firma
+    `firma_previa`); si no, se descarta para que la próxima consulta lo
+    reconstruya en lugar de marcarlo como vigente.
+    """
+    indice = _cache.get(filepath_miembros)
+    if indice and indice["firma"] != firma_previa:
+        del _cache[filepath_miembros]
+        return None
+    return indice
+
+
+def registrar_miembro(
+    filepath_miembros: str, miembro: Dict[str, Any], firma_previa: Tuple
+) -> None:
+    """
+    Actualiza el índice tras guardar un miembro nuevo o modificado, evitando
+    reconstruirlo en la siguiente consulta.
+
+    :param firma_previa: `datos.firma_archivo(filepath_miembros)` tomada antes
+        de escribir.
+    """
+    indice = _indice_al_dia(filepath_miembros, firma_previa)
+    if not indice:
+        return
+    _quitar(indice, miembro.get("id_miembro", ""))
+    entrada = _entrada(miembro)
+    if entrada:
+        bisect.insort(indice["entradas"], entrada)
+        indice["por_id"][entrada[1]] = entrada[0]
+    indice["firma"] = datos.firma_archivo(filepath_miembros)
+
+
+def registrar_eliminacion(
+    filepath_miembros: str, id_miembro: str, firma_previa: Tuple
+) -> None:
+    """Actualiza el índice tras eliminar a un miembro."""
+    indice = _indice_al_dia(filepath_miembros, firma_previa)
+    if indice:
+        _quitar(indice, id_miembro)
+        indice["firma"] = datos.firma_archivo(filepath_miembros)
+
+
+def por_vencer(
+    filepath_miembros: str, dias: int = 7, hoy: Optional[date] = None
+) -> List[Tuple[str, str]]:
+    """
+    Miembros activos que vencen entre hoy y dentro de `dias` días (inclusive).
+
+    :return: Lista de (fecha_vencimiento, id_miembro), de la más próxima a la
+        más lejana.
+    """
+    hoy = hoy or date.today()
+    entradas = indice_vencimientos(filepath_miembros)["entradas"]
+    desde = bisect.bisect_left(entradas, (hoy.isoformat(),))
+    limite = (hoy + timedelta(days=dias + 1)).isoformat()
+    hasta = bisect.bisect_left(entradas, (limite,))
+    return entradas[desde:hasta]
+
+
+def vencidos(
+    filepath_miembros: str, hoy: Optional[date] = None
+) -> List[Tuple[str, str]]:
+    """Miembros activos cuya suscripción venció antes de hoy."""
+    hoy = hoy or date.today()
+    entradas = indice_vencimientos(filepath_miembros)["entradas"]
+    return entradas[: bisect.bisect_left(entradas, (hoy.isoformat(),))]
+
+
+def barrer_vencidos(
+    filepath_miembros: str,
+    filepath_inscripciones: str,
+    hoy: Optional[date] = None,
+) -> Dict[str, int]:
+    """
+    Desactiva a los miembros vencidos y elimina sus inscripciones.
+
+    `miembros.csv` y el archivo de inscripciones se escriben una sola vez (en
+    el formato particionado, una vez cada partición afectada y el índice).
+
+    :return: {"desactivados": n, "inscripciones": n eliminadas}.
+    """
+    ids = {id_miembro for _, id_miembro in vencidos(filepath_miembros, hoy)}
+    if not ids:
+        return {"desactivados": 0, "inscripciones": 0}
+
+    if particiones.es_particionado(filepath_inscripciones):
+        eliminadas = particiones.eliminar_inscripciones_de_miembros(
+            filepath_inscripciones, ids
+        )
+    elif os.path.exists(filepath_inscripciones):
+        inscripciones = datos.cargar_datos(filepath_inscripciones)
+        restantes = [i for i in inscripciones if i.get("id_miembro") not in ids]
+        eliminadas = len(inscripciones) - len(restantes)
+        if eliminadas:
+            datos.guardar_datos(filepath_inscripciones, restantes)
+    else:
+        eliminadas = 0
+
+    firma_previa = datos.firma_archivo(filepath_miembros)
+    miembros = datos.cargar_datos(filepath_miembros)
+    for miembro in miembros:
+        if miembro.get("id_miembro") in ids:
+            miembro["activo"] = INACTIVO
+    datos.guardar_datos(filepath_miembros, miembros)
+
+    # Los vencidos son un prefijo del índice: se descartan sin reconstruirlo.
+    indice = _indice_al_dia(filepath_miembros, firma_previa)
+    if indice:
+        for id_miembro in ids:
+            _quitar(indice, id_miembro)
+        indice["firma"] = datos.firma_archivo(filepath_miembros)
+    return {"desactivados": len(ids), "inscripciones": eliminadas}
+
+
+def invalidar_cache() -> None:
+    """Descarta los índices en memoria."""
+    _cache.clear()
+
+
+def mostrar_por_vencer(filepath_miembros: str, dias: int = 7) -> None:
+    """Muestra los miembros que vencen en los próximos `dias` días."""
+    proximos = por_vencer(filepath_miembros, dias)
+    if not proximos:
+        console.print(f"[green]Nadie vence en los próximos {dias} días.[/green]")
+        return
+    miembros = datos.indexar(filepath_miembros, "id_miembro")
+    tabla = Table(title=f"VENCEN EN LOS PRÓXIMOS {dias} DÍAS", style="cyan")
+    tabla.add_column("Vence", justify="center", style="yellow")
+    tabla.add_column("ID", justify="center")
+    tabla.add_column("Nombre")
+    tabla.add_column("Suscripción", justify="center", style="magenta")
+    for fecha, id_miembro in proximos:
+        miembro = miembros.get(id_miembro, {})
+        tabla.add_row(
+            fecha,
+            id_miembro,
+            miembro.get("nombre", ""),
+            miembro.get("tipo_suscripcion", ""),
+        )
+    console.print(tabla)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vencimientos de suscripciones.")
+    # Mismo valor por defecto que crud.INFO_DIR.
+    parser.add_argument(
+        "--info",
+        default=os.environ.get("GYM_INFO_DIR", "info"),
+        help="Directorio de datos",
+    )
+    parser.add_argument("--dias", type=int, default=7)
+    parser.add_argument(
+        "--barrer", action="store_true", help="Desactiva a los miembros vencidos"
+    )
+    args = parser.parse_args()
+
+    filepath_miembros = os.path.join(args.info, "miembros.csv")
+    if args.barrer:
+        resultado = barrer_vencidos(
+            filepath_miembros, particiones.ruta_inscripciones(args.info)
+        )
+        console.print(
+            f"[green]{resultado['desactivados']} miembros desactivados, "
+            f"{resultado['inscripciones']} inscripciones eliminadas.[/green]"
+        )
+    mostrar_por_vencer(filepath_miembros, args.dias)
+
+
+if __name__ == "__main__":
+    main()